@@ -1,22 +1,64 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
-from werkzeug.security import check_password_hash, generate_password_hash
-from datetime import datetime, timedelta
+from flask_jwt_extended import JWTManager, create_access_token, get_jwt_identity
+import jwt as pyjwt
+from werkzeug.security import check_password_hash
+from argon2 import PasswordHasher
+from argon2.exceptions import VerificationError, InvalidHashError
+from datetime import timedelta
+from decimal import Decimal, ROUND_HALF_UP
 import os
+import sys
 from dotenv import load_dotenv
-import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, IntegrityError, PoolError, pooling
 from functools import wraps
 from flasgger import Swagger
+from cachetools import TTLCache
+import fastjsonschema
+from fastjsonschema import JsonSchemaException
+from threading import Lock, RLock
+from concurrent.futures import ThreadPoolExecutor
+from gevent import monkey as gevent_monkey
+from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+import hashlib
 import json
+import orjson
+import redis
+import re
+import time
 
 load_dotenv()
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson.
+    
+    Dates and Decimals are still handed to Flask's default hook, so responses
+    keep the same format as the stdlib provider - only faster to produce.
+    """
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    
+    def dumps(self, obj, **kwargs):
+        option = self.option | orjson.OPT_INDENT_2 if kwargs.get('indent') else self.option
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = self.option | orjson.OPT_APPEND_NEWLINE
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(orjson.dumps(obj, default=self.default, option=option), mimetype=self.mimetype)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'your-secret-key-change-in-production')
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=24)
 app.config['JWT_ALGORITHM'] = 'HS256'
+JWT_SECRET_KEY = app.config['JWT_SECRET_KEY']
+JWT_ALGORITHM = app.config['JWT_ALGORITHM']
 
 # CORS configuration - Allow all origins for development
 # For production, specify exact origins
@@ -25,7 +67,7 @@ CORS(app,
      methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
      allow_headers=["Content-Type", "Authorization", "X-Requested-With"],
      supports_credentials=True,
-     expose_headers=["Content-Type", "Authorization"])
+     expose_headers=["Content-Type", "Authorization", "X-Total-Count"])
 
 jwt = JWTManager(app)
 
@@ -102,9 +144,12 @@ swagger_template = {
     ]
 }
 
-swagger = Swagger(app, config=swagger_config, template=swagger_template)
+# Swagger parses every route docstring at startup; production deployments
+# set ENABLE_SWAGGER=0 to skip it and keep worker boot fast
+if os.getenv('ENABLE_SWAGGER', '1') == '1':
+    swagger = Swagger(app, config=swagger_config, template=swagger_template)
 
-# MySQL connection - Lazy initialization to avoid connection during import (for CI/testing)
+# MySQL connection pool - Lazy initialization to avoid connection during import (for CI/testing)
 DB_CONFIG = {
     'host': os.getenv('DB_HOST', 'localhost'),
     'database': os.getenv('DB_NAME', 'pharmacy'),
@@ -113,45 +158,148 @@ DB_CONFIG = {
     'port': int(os.getenv('DB_PORT', 3306)),
     'charset': 'utf8mb4',
     'collation': 'utf8mb4_unicode_ci',
-    'autocommit': True
+    # Every statement commits on its own, so single-statement writes need no
+    # COMMIT round trip. Writes spanning several statements open an explicit
+    # transaction with conn.start_transaction() and commit it.
+    'autocommit': True,
+    'connection_timeout': int(os.getenv('DB_CONNECT_TIMEOUT', 5)),
+    # Compress the client/server protocol - list endpoints move a lot of text
+    'compress': os.getenv('DB_COMPRESS', 'true').lower() == 'true',
+    # The C extension's socket I/O can't be monkey-patched, so under gevent
+    # workers every query would block the whole worker. The pure-Python
+    # protocol reads through the patched socket module and lets other
+    # greenlets run while MySQL answers.
+    'use_pure': os.getenv('DB_USE_PURE', str(gevent_monkey.is_module_patched('socket'))).lower() == 'true'
 }
 
-db_connection = None
-db_cursor = None
+# Connections per worker process. The pool opens all of them up front, so the
+# first requests after start-up don't pay for the TCP and auth handshakes.
+# mysql-connector caps a pool at 32 connections.
+DB_POOL_SIZE = min(int(os.getenv('DB_POOL_SIZE', 10)), pooling.CNX_POOL_MAXSIZE)
+
+# A gevent worker runs far more requests at once than it has connections.
+# mysql-connector fails immediately when the pool is empty, so wait up to
+# this many seconds for a connection to be returned before giving up.
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', 2))
+
+db_pool = None
+db_pool_lock = Lock()
+
+def get_pool():
+    """Create the connection pool on first use. Each worker process builds its own after fork."""
+    global db_pool
+    
+    if db_pool is None:
+        with db_pool_lock:
+            if db_pool is None:
+                # No session state is kept between requests (autocommit is on and
+                # release_db rolls back stray transactions), so skip the
+                # COM_RESET_CONNECTION round trip on every return to the pool
+                db_pool = pooling.MySQLConnectionPool(pool_name='pharmacy', pool_size=DB_POOL_SIZE,
+                                                      pool_reset_session=False, **DB_CONFIG)
+                print("MySQL connection pool established successfully")
+    return db_pool
+
+def borrow_connection():
+    """Take a connection from the pool, waiting up to DB_POOL_TIMEOUT while all are in use."""
+    deadline = time.monotonic() + DB_POOL_TIMEOUT
+    while True:
+        try:
+            return get_pool().get_connection()
+        except PoolError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.01)
 
 def get_db():
-    """Initialize MySQL connection lazily. This allows imports to succeed without MySQL connection."""
-    global db_connection, db_cursor
+    """Borrow a pooled MySQL connection for the current app context.
     
-    if db_connection is None or not db_connection.is_connected():
+    The connection is returned to the pool when the context tears down. This
+    allows imports to succeed without MySQL connection.
+    """
+    if 'db' not in g:
         try:
-            db_connection = mysql.connector.connect(**DB_CONFIG)
-            db_cursor = db_connection.cursor(dictionary=True, buffered=True)
-            print("MySQL connection established successfully")
+            g.db = borrow_connection()
         except Error as e:
             # If connection fails during import (e.g., in CI), allow import to succeed
             if os.getenv('CI') or os.getenv('GITHUB_ACTIONS'):
                 print(f"Warning: MySQL connection skipped in CI environment: {e}")
-            else:
-                raise ConnectionError(f"MySQL connection failed: {e}")
-    
-    return db_connection
+                return None
+            raise ConnectionError(f"MySQL connection failed: {e}")
+    
+    return g.db
+
+@app.teardown_appcontext
+def release_db(exception=None):
+    """Return the context's MySQL connection to the pool."""
+    conn = g.pop('db', None)
+    if conn is not None:
+        # Sessions aren't reset on return to the pool, so drop any result a
+        # failed handler left unread before the next request gets this connection
+        try:
+            if conn.unread_result:
+                conn.consume_results()
+            if conn.in_transaction:
+                conn.rollback()
+        except Error as e:
+            # The session can't be cleaned up, so don't hand it to another request.
+            # The pool reconnects a disconnected connection on its next checkout.
+            print(f"Warning: Dropping MySQL connection that could not be reset: {e}")
+            conn.disconnect()
+        conn.close()
+
+# Password hashing - Argon2id with a fixed cost. The parameters are stored in each
+# hash, so raising them later upgrades users transparently on their next login.
+password_hasher = PasswordHasher(time_cost=2, memory_cost=19456, parallelism=1)
+
+# Hashing runs in C with the GIL released, so a small dedicated pool keeps the
+# CPU-heavy work off the request thread and lets other requests progress.
+# Under gevent workers threading is monkey-patched and a plain executor would
+# run on the event loop, so use gevent's pool of native threads there instead.
+_hash_executor_class = NativeThreadPoolExecutor if gevent_monkey.is_module_patched('threading') else ThreadPoolExecutor
+_hash_pool = _hash_executor_class(max_workers=int(os.getenv('PASSWORD_HASH_WORKERS', 4)))
+
+def hash_password(password):
+    """Hash a plain-text password for storage."""
+    return _hash_pool.submit(password_hasher.hash, password).result()
+
+def verify_password(user, password):
+    """Check a password against a user row, re-hashing legacy or outdated hashes."""
+    stored = user['password']
+    if stored.startswith('$argon2'):
+        try:
+            _hash_pool.submit(password_hasher.verify, stored, password).result()
+        except (VerificationError, InvalidHashError):
+            return False
+        needs_rehash = password_hasher.check_needs_rehash(stored)
+    else:
+        # Werkzeug PBKDF2/scrypt hash created before the switch to Argon2
+        if not _hash_pool.submit(check_password_hash, stored, password).result():
+            return False
+        needs_rehash = True
+    
+    if needs_rehash:
+        conn = get_db()
+        cursor = conn.cursor()
+        cursor.execute("UPDATE users SET password = %s WHERE id = %s", (hash_password(password), user['id']))
+        cursor.close()
+        _invalidate_user(user['id'])
+    return True
 
 # Initialize admin user if not exists (only when actually running, not during import)
 def init_admin():
     """Initialize admin user. Only runs when database is actually accessed."""
     try:
-        get_db()  # Ensure database is connected
-        cursor = db_connection.cursor(dictionary=True)
+        conn = get_db()
+        cursor = conn.cursor(dictionary=True)
         cursor.execute("SELECT COUNT(*) as count FROM users WHERE role = 'admin'")
         result = cursor.fetchone()
         
         if result and result['count'] == 0:
             cursor.execute(
                 "INSERT INTO users (username, password, email, role) VALUES (%s, %s, %s, %s)",
-                ('admin', generate_password_hash('admin123'), 'admin@pharmacy.com', 'admin')
+                ('admin', hash_password('admin123'), 'admin@pharmacy.com', 'admin')
             )
-            db_connection.commit()
             print("Default admin created: username='admin', password='admin123'")
         cursor.close()
     except (ConnectionError, Exception) as e:
@@ -161,20 +309,317 @@ def init_admin():
 
 # Don't call init_admin() at import time - will be called when app starts
 
+# Indexes the queries below rely on. New databases get them from schema.sql;
+# init_indexes() adds any that are missing from databases created earlier.
+DB_INDEXES = {
+    'users': [
+        ('uq_users_phone', "ALTER TABLE users ADD UNIQUE INDEX uq_users_phone (phone)"),
+        ('uq_users_email', "ALTER TABLE users ADD UNIQUE INDEX uq_users_email (email)"),
+    ],
+    'products': [
+        ('ft_products_search', "ALTER TABLE products ADD FULLTEXT INDEX ft_products_search (name, description, category)"),
+    ],
+    # List endpoints filter on one column and sort newest first, so these
+    # compound indexes serve both the lookup and the ORDER BY
+    'orders': [
+        # Admin order list and the dashboard's recent orders
+        ('idx_created_at', "ALTER TABLE orders ADD INDEX idx_created_at (created_at)"),
+        ('idx_orders_phone_created', "ALTER TABLE orders ADD INDEX idx_orders_phone_created (customer_phone, created_at DESC)"),
+    ],
+    'offers': [
+        ('idx_offers_active_created', "ALTER TABLE offers ADD INDEX idx_offers_active_created (active, created_at DESC)"),
+    ],
+    'testimonials': [
+        ('idx_testimonials_approved_created', "ALTER TABLE testimonials ADD INDEX idx_testimonials_approved_created (approved, created_at DESC)"),
+    ],
+    'callback_requests': [
+        ('idx_callbacks_status_created', "ALTER TABLE callback_requests ADD INDEX idx_callbacks_status_created (status, created_at DESC)"),
+    ],
+}
+
+# Clean-ups to run on existing data before an index can be created. Earlier
+# versions stored '' for a missing email or phone, which would collide on the
+# unique indexes, so those become NULL first.
+DB_INDEX_PREPARE = {
+    'uq_users_phone': "UPDATE users SET phone = NULL WHERE phone = ''",
+    'uq_users_email': "UPDATE users SET email = NULL WHERE email = ''",
+}
+
+def init_indexes():
+    """Create any missing indexes from DB_INDEXES. Safe to run on every start."""
+    try:
+        conn = get_db()
+        cursor = conn.cursor(dictionary=True)
+        for table, indexes in DB_INDEXES.items():
+            cursor.execute(f"SHOW INDEX FROM {table}")
+            existing = {row['Key_name'] for row in cursor.fetchall()}
+            for name, ddl in indexes:
+                if name in existing:
+                    continue
+                try:
+                    if name in DB_INDEX_PREPARE:
+                        cursor.execute(DB_INDEX_PREPARE[name])
+                    cursor.execute(ddl)
+                    print(f"Created index {name} on {table}")
+                except Error as e:
+                    print(f"Warning: Could not create index {name} on {table}: {e}")
+        cursor.close()
+    except (ConnectionError, Exception) as e:
+        if not (os.getenv('CI') or os.getenv('GITHUB_ACTIONS')):
+            print(f"Warning: Could not initialize indexes: {e}")
+
+USER_CONTACT_INDEXES = {'uq_users_phone', 'uq_users_email'}
+_user_contacts_unique = False
+
+def user_contacts_unique(cursor):
+    """Whether users has its unique email and phone indexes.
+    
+    Only a positive answer is remembered, so a database that init_indexes()
+    could not migrate is checked again on the next call.
+    """
+    global _user_contacts_unique
+    if not _user_contacts_unique:
+        cursor.execute("SHOW INDEX FROM users")
+        _user_contacts_unique = USER_CONTACT_INDEXES <= {row['Key_name'] for row in cursor.fetchall()}
+    return _user_contacts_unique
+
+# Running order totals for the dashboard, kept in one row of order_stats so
+# the stats endpoint reads them instead of re-aggregating every order
+ORDER_STATS_DDL = (
+    "CREATE TABLE IF NOT EXISTS order_stats ("
+    "id TINYINT PRIMARY KEY, "
+    "total_orders INT NOT NULL DEFAULT 0, "
+    "pending_orders INT NOT NULL DEFAULT 0, "
+    "total_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0"
+    ") ENGINE=InnoDB"
+)
+ORDER_STATS_SEED = (
+    "INSERT IGNORE INTO order_stats (id, total_orders, pending_orders, total_revenue) "
+    "SELECT 1, COUNT(*), COALESCE(SUM(status = 'pending'), 0), "
+    "COALESCE(SUM(CASE WHEN status != 'cancelled' THEN total END), 0) FROM orders"
+)
+
+def init_order_stats():
+    """Create and seed the order_stats row if missing. Safe to run on every start."""
+    try:
+        conn = get_db()
+        cursor = conn.cursor()
+        cursor.execute(ORDER_STATS_DDL)
+        cursor.execute(ORDER_STATS_SEED)
+        cursor.close()
+    except (ConnectionError, Exception) as e:
+        if not (os.getenv('CI') or os.getenv('GITHUB_ACTIONS')):
+            print(f"Warning: Could not initialize order stats: {e}")
+
+def bump_order_stats(cursor, orders=0, pending=0, revenue=0):
+    """Apply deltas to the order_stats row. Call inside the order's transaction."""
+    if not (orders or pending or revenue):
+        return
+    cursor.execute(
+        "UPDATE order_stats SET total_orders = total_orders + %s, "
+        "pending_orders = pending_orders + %s, total_revenue = total_revenue + %s WHERE id = 1",
+        (orders, pending, revenue)
+    )
+    # With a non-zero delta, no changed row means the seed row is missing (a
+    # database migrated without it). Seeding from orders inside the same
+    # transaction already counts this change, so nothing is lost.
+    if cursor.rowcount == 0:
+        cursor.execute(ORDER_STATS_SEED)
+
+# User columns that are safe to return. Only the login routes read the password hash.
+USER_PUBLIC_COLUMNS = "id, username, email, phone, name, address, role, created_at"
+# What the login routes need: the password hash plus the fields they return
+USER_LOGIN_COLUMNS = "id, username, email, phone, name, role, password"
+# Columns returned by the staff user endpoints and by the other tables' endpoints.
+# Ids come back from MySQL already as strings, so rows go straight to JSON.
+USER_STAFF_COLUMNS = "CAST(id AS CHAR) AS id, username, email, role, created_at"
+PRODUCT_COLUMNS = "CAST(id AS CHAR) AS id, name, description, price, stock, category, image, created_at, updated_at"
+ORDER_COLUMNS = ("CAST(id AS CHAR) AS id, customer_name, customer_phone, customer_address, items, "
+                 "subtotal, discount, total, offer_code, status, created_at, updated_at")
+OFFER_COLUMNS = "CAST(id AS CHAR) AS id, code, type, value, description, active, created_at, updated_at"
+TESTIMONIAL_COLUMNS = "CAST(id AS CHAR) AS id, customer_name, review, rating, approved, created_at"
+CALLBACK_COLUMNS = "CAST(id AS CHAR) AS id, name, phone, email, medicine, message, status, created_at"
+
+# Users loaded from JWT identities. Every protected route looks the caller up by
+# id, and role checks authorize from the result, so a cached copy must be dropped
+# everywhere the moment a user is changed or deleted. With Redis the users are
+# cached there, where _invalidate_user() reaches every worker. Without it each
+# lookup reads MySQL.
+USER_CACHE_TTL = 30
+
+def _get_user_by_id(user_id):
+    """Load a user by id, serving repeated lookups from the shared cache."""
+    key = str(user_id)
+    if not key.isdigit():
+        # Not a users.id (e.g. a token minted with another identity) - skip the query
+        return None
+    cached = shared_cache_read(f'user:{key}')
+    if cached is not None:
+        return orjson.loads(cached)
+    
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(f"SELECT {USER_PUBLIC_COLUMNS} FROM users WHERE id = %s", (user_id,))
+    user = cursor.fetchone()
+    cursor.close()
+    
+    if user:
+        shared_cache_write(f'user:{key}', orjson.dumps(user, default=app.json.default, option=app.json.option),
+                           USER_CACHE_TTL)
+    return user
+
+def _invalidate_user(user_id):
+    """Drop a cached user after it has been modified or deleted."""
+    shared_cache_delete(f'user:{user_id}')
+
+# Active offers by code. Checkout and cart pages look up the same few codes
+# repeatedly; misses are cached as False so unknown codes skip MySQL too.
+# Invalidation only reaches the worker that made the change, so this serves the
+# public lookup endpoint alone; create_order reads the offer in its transaction.
+_offer_cache = TTLCache(maxsize=256, ttl=60)
+_offer_cache_lock = RLock()
+
+# offers.code is VARCHAR(50); anything longer can't match, so scanners probing
+# random codes don't reach MySQL or push real codes out of the cache
+OFFER_CODE_MAX_LENGTH = 50
+
+def lookup_offer(code):
+    """Return the active offer for a code (id already stringified), or None."""
+    if len(code) > OFFER_CODE_MAX_LENGTH:
+        return None
+    # Offer codes are stored upper-cased and compared case-insensitively
+    key = code.upper()
+    with _offer_cache_lock:
+        cached = _offer_cache.get(key)
+    if cached is not None:
+        return cached or None
+    
+    cursor = get_db().cursor(dictionary=True)
+    cursor.execute(f"SELECT {OFFER_COLUMNS} FROM offers WHERE code = %s AND active = TRUE", (key,))
+    offer = cursor.fetchone()
+    cursor.close()
+    
+    with _offer_cache_lock:
+        _offer_cache[key] = offer or False
+    return offer
+
+# Optional Redis cache shared by every worker, used for the public list pages
+# that everyone loads and the dashboard stats. Without REDIS_URL these are
+# always read from MySQL.
+REDIS_URL = os.getenv('REDIS_URL')
+redis_client = redis.Redis.from_url(REDIS_URL, socket_timeout=0.5) if REDIS_URL else None
+SHARED_CACHE_TTL = int(os.getenv('SHARED_CACHE_TTL', 30))
+
+def shared_cache_read(key):
+    """Return the bytes cached in Redis under key, or None on a miss."""
+    if not key or redis_client is None:
+        return None
+    try:
+        return redis_client.get(key)
+    except redis.RedisError as e:
+        print(f"Warning: Redis read failed for {key}: {e}")
+        return None
+
+def shared_cache_write(key, value, ttl=SHARED_CACHE_TTL):
+    """Store bytes in Redis under key for ttl seconds."""
+    if redis_client is None:
+        return
+    try:
+        redis_client.setex(key, ttl, value)
+    except redis.RedisError as e:
+        print(f"Warning: Redis write failed for {key}: {e}")
+
+def shared_cache_get(key):
+    """Return a list response cached in Redis, or None on a miss."""
+    value = shared_cache_read(key)
+    if value is None:
+        return None
+    total, body = value.split(b'\n', 1)
+    return list_response(body, int(total))
+
+def shared_cache_set(key, body, total):
+    """Store an encoded list page and its total in Redis."""
+    shared_cache_write(key, str(total).encode() + b'\n' + body)
+
+def shared_cache_delete(key):
+    """Drop a shared cache entry after the rows behind it change."""
+    if redis_client is None:
+        return
+    try:
+        redis_client.delete(key)
+    except redis.RedisError as e:
+        print(f"Warning: Redis delete failed for {key}: {e}")
+
+def _invalidate_offers():
+    """Forget cached offers after any offer is created, changed or deleted."""
+    with _offer_cache_lock:
+        _offer_cache.clear()
+    shared_cache_delete('offers:active')
+
+# Encoded dashboard response, so admins polling the dashboard share one computation
+# every few seconds instead of re-running the queries on each refresh. With Redis
+# configured the body is also shared between workers.
+DASHBOARD_STATS_TTL = 10
+_stats_cache = TTLCache(maxsize=1, ttl=DASHBOARD_STATS_TTL)
+_stats_cache_lock = RLock()
+
+def _invalidate_stats():
+    """Drop the cached dashboard figures after orders or products change."""
+    with _stats_cache_lock:
+        _stats_cache.clear()
+    shared_cache_delete('dashboard:stats')
+
+# Recently verified access tokens keyed by a digest of the raw token, so repeat
+# requests with the same bearer token skip signature verification and decoding.
+_token_cache = TTLCache(maxsize=10000, ttl=5)
+_token_cache_lock = RLock()
+
+def token_required(f):
+    """Drop-in replacement for @jwt_required() that verifies the bearer token with PyJWT directly."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        auth_header = request.headers.get('Authorization', '')
+        if not auth_header.startswith('Bearer '):
+            return jsonify({'message': 'Missing Authorization Header'}), 401
+        
+        token = auth_header[7:]
+        key = hashlib.sha256(token.encode()).digest()[:16]
+        with _token_cache_lock:
+            cached = _token_cache.get(key)
+        
+        if cached and cached[1].get('exp', 0) > time.time():
+            header, payload = cached
+        else:
+            try:
+                header = pyjwt.get_unverified_header(token)
+                payload = pyjwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+            except pyjwt.PyJWTError:
+                return jsonify({'message': 'Invalid or expired token'}), 401
+            if payload.get('type') != 'access' or 'sub' not in payload:
+                return jsonify({'message': 'Invalid or expired token'}), 401
+            with _token_cache_lock:
+                _token_cache[key] = (header, payload)
+        
+        # Populate the same request context flask-jwt-extended would, so
+        # get_jwt_identity() keeps working inside the view
+        g._jwt_extended_jwt_header = header
+        g._jwt_extended_jwt = payload
+        g._jwt_extended_jwt_user = None
+        g._jwt_extended_jwt_location = 'headers'
+        return f(*args, **kwargs)
+    return decorated_function
+
 # Role-based access control decorators
 def role_required(*allowed_roles):
+    allowed = frozenset(allowed_roles)
     def decorator(f):
         @wraps(f)
-        @jwt_required()
+        @token_required
         def decorated_function(*args, **kwargs):
             current_user = get_jwt_identity()
-            get_db()
-            cursor = db_connection.cursor(dictionary=True)
-            cursor.execute("SELECT * FROM users WHERE id = %s", (current_user,))
-            user = cursor.fetchone()
-            cursor.close()
+            user = _get_user_by_id(current_user)
             
-            if not user or user.get('role') not in allowed_roles:
+            if not user or user.get('role') not in allowed:
                 return jsonify({'message': f'Access denied. Required roles: {", ".join(allowed_roles)}'}), 403
             return f(*args, **kwargs)
         return decorated_function
@@ -183,52 +628,392 @@ def role_required(*allowed_roles):
 # Admin only decorator
 def admin_required(f):
     @wraps(f)
-    @jwt_required()
+    @token_required
     def decorated_function(*args, **kwargs):
         user_id = get_jwt_identity()
-        get_db()
-        cursor = db_connection.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM users WHERE id = %s", (user_id,))
-        user = cursor.fetchone()
-        cursor.close()
+        user = _get_user_by_id(user_id)
         
         if not user or user.get('role') != 'admin':
             return jsonify({'message': 'Admin access required'}), 403
         return f(*args, **kwargs)
     return decorated_function
 
+# List endpoints return at most one page of rows per request
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def get_pagination():
+    """Read the limit/skip query params, clamped to sane bounds."""
+    limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+    skip = request.args.get('skip', 0, type=int)
+    return max(1, min(limit, MAX_PAGE_SIZE)), max(0, skip)
+
+def list_response(body, total):
+    """JSON list response from an already encoded body, with the row count in X-Total-Count."""
+    response = app.response_class(body, mimetype='application/json')
+    response.headers['X-Total-Count'] = str(total)
+    return response
+
+def paginated_response(cursor, total, transform=None, cache_key=None):
+    """Stream the rows left on a cursor as a JSON array, with the unpaginated
+    row count in X-Total-Count.
+    
+    Each row is serialized as it comes off the cursor rather than collecting
+    the page into a list first. The cursor is closed after the last row.
+    With a cache_key and Redis configured, the page is rendered in full
+    instead and stored in the shared cache.
+    """
+    if cache_key and redis_client is not None:
+        rows = [transform(row) if transform else row for row in cursor]
+        cursor.close()
+        body = orjson.dumps(rows, default=app.json.default, option=app.json.option | orjson.OPT_APPEND_NEWLINE)
+        shared_cache_set(cache_key, body, total)
+        return list_response(body, total)
+    
+    def generate():
+        try:
+            separator = b'['
+            for row in cursor:
+                if transform:
+                    row = transform(row)
+                yield separator + orjson.dumps(row, default=app.json.default, option=app.json.option)
+                separator = b','
+            yield b'[]\n' if separator == b'[' else b']\n'
+        finally:
+            # A client that disconnects mid-stream leaves rows unread on this
+            # unbuffered cursor, and close() refuses to run over them. Drain
+            # them first so the connection goes back to the pool clean.
+            conn = g.get('db')
+            try:
+                if conn is not None and conn.unread_result:
+                    conn.consume_results()
+                cursor.close()
+            except Error as e:
+                print(f"Warning: Could not close streamed cursor: {e}")
+    
+    response = app.response_class(stream_with_context(generate()), mimetype='application/json')
+    response.headers['X-Total-Count'] = str(total)
+    return response
+
+def format_order(order):
+    """Shape an orders row for the API: parsed items, nested customer."""
+    order['items'] = orjson.loads(order['items'])
+    order['customer'] = {
+        'name': order.pop('customer_name'),
+        'phone': order.pop('customer_phone'),
+        'address': order.pop('customer_address')
+    }
+    return order
+
+def update_and_fetch(cursor, table, values, row_id, columns='*'):
+    """Run an UPDATE and re-read the row in a single round trip.
+    
+    values maps column names to their new values. Returns the updated row,
+    or None when no row has that id.
+    """
+    assignments = ', '.join(f"{column} = %s" for column in values)
+    sql = (f"UPDATE {table} SET {assignments} WHERE id = %s; "
+           f"SELECT {columns} FROM {table} WHERE id = %s")
+    row = None
+    for result in cursor.execute(sql, (*values.values(), row_id, row_id), multi=True):
+        if result.with_rows:
+            rows = result.fetchall()
+            row = rows[0] if rows else None
+    return row
+
+def update_many(cursor, table, values, row_ids):
+    """Apply the same UPDATE to a list of ids in a single statement.
+    
+    Returns the number of rows whose values actually changed.
+    """
+    assignments = ', '.join(f"{column} = %s" for column in values)
+    placeholders = ', '.join(['%s'] * len(row_ids))
+    cursor.execute(f"UPDATE {table} SET {assignments} WHERE id IN ({placeholders})",
+                   (*values.values(), *row_ids))
+    return cursor.rowcount
+
+def blank_to_null(value):
+    """Store an empty string as NULL, so it can't collide on a unique index."""
+    return value or None
+
+# Columns each PUT endpoint may change, with the conversion applied to the
+# request value (None stores it as sent)
+USER_UPDATE_FIELDS = {'password': hash_password, 'email': blank_to_null, 'role': None}
+PRODUCT_UPDATE_FIELDS = {'name': None, 'description': None, 'price': float, 'stock': int, 'category': None, 'image': None}
+OFFER_UPDATE_FIELDS = {'type': None, 'value': float, 'description': None, 'active': None}
+TESTIMONIAL_UPDATE_FIELDS = {'customer_name': None, 'review': None, 'rating': int, 'approved': None}
+
+def pick_fields(data, fields):
+    """Collect the updatable fields present in a request body, converted for storage."""
+    return {key: cast(data[key]) if cast else data[key] for key, cast in fields.items() if key in data}
+
+def insert_and_fetch(cursor, table, values, columns='*'):
+    """Run an INSERT and read the new row back in a single round trip.
+    
+    values maps column names to the values to insert.
+    """
+    placeholders = ', '.join(['%s'] * len(values))
+    sql = (f"INSERT INTO {table} ({', '.join(values)}) VALUES ({placeholders}); "
+           f"SELECT {columns} FROM {table} WHERE id = LAST_INSERT_ID()")
+    row = None
+    for result in cursor.execute(sql, tuple(values.values()), multi=True):
+        if result.with_rows:
+            rows = result.fetchall()
+            row = rows[0] if rows else None
+    return row
+
+# InnoDB ignores words shorter than innodb_ft_min_token_size (3 by default)
+FULLTEXT_MIN_WORD_LENGTH = 3
+
+def fulltext_query(search):
+    """Turn free text into a BOOLEAN MODE query matching every word as a prefix.
+    
+    Returns None when no word is long enough to be in the full-text index.
+    """
+    words = [w for w in re.findall(r'\w+', search) if len(w) >= FULLTEXT_MIN_WORD_LENGTH]
+    if not words:
+        return None
+    return ' '.join(f'+{w}*' for w in words)
+
+def to_money(value):
+    """Round a number the way a DECIMAL(10, 2) column stores it."""
+    return Decimal(str(value)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+
+# Allowed values for the ENUM columns, in the order the schema declares them
+ORDER_STATUSES = ('pending', 'confirmed', 'processing', 'shipped', 'delivered', 'cancelled')
+CALLBACK_STATUSES = ('pending', 'contacted', 'completed')
+OFFER_TYPES = ('percentage', 'fixed')
+STAFF_ROLES = frozenset({'admin', 'driver', 'helper'})
+
+# Request body schemas, compiled once at import into plain Python validators
+NUMBER = {'type': ['number', 'string'], 'pattern': r'^-?\d+(\.\d+)?$'}
+STOCK = {'type': ['integer', 'string'], 'pattern': r'^\d+$', 'minimum': 0}
+RATING = {'type': ['integer', 'string'], 'pattern': r'^[1-5]$', 'minimum': 1, 'maximum': 5}
+# Bulk endpoints take ids as returned by the API (strings) or as plain integers
+ID_LIST = {
+    'type': 'array',
+    'minItems': 1,
+    'maxItems': MAX_PAGE_SIZE,
+    'items': {'type': ['integer', 'string'], 'pattern': r'^\d+$', 'minimum': 1}
+}
+
+VALIDATE_ORDER = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['customer', 'items'],
+    'properties': {
+        'customer': {'type': 'object', 'required': ['name', 'phone', 'address']},
+        'items': {'type': 'array', 'minItems': 1, 'items': {'type': 'object', 'required': ['product_id', 'quantity']}},
+        'total': NUMBER,
+        'offer_code': {'type': ['string', 'null']}
+    }
+})
+
+VALIDATE_ORDER_STATUS = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['status'],
+    'properties': {
+        'status': {'enum': list(ORDER_STATUSES)}
+    }
+})
+
+VALIDATE_PRODUCT = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['name', 'price', 'stock'],
+    'properties': {
+        'name': {'type': 'string'},
+        'price': NUMBER,
+        'stock': STOCK
+    }
+})
+
+VALIDATE_PRODUCT_UPDATE = fastjsonschema.compile({
+    'type': 'object',
+    'properties': {
+        'name': {'type': 'string'},
+        'price': NUMBER,
+        'stock': STOCK
+    }
+})
+
+VALIDATE_OFFER = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['code', 'type', 'value'],
+    'properties': {
+        'code': {'type': 'string'},
+        'type': {'enum': list(OFFER_TYPES)},
+        'value': NUMBER
+    }
+})
+
+VALIDATE_OFFER_UPDATE = fastjsonschema.compile({
+    'type': 'object',
+    'properties': {
+        'type': {'enum': list(OFFER_TYPES)},
+        'value': NUMBER
+    }
+})
+
+VALIDATE_TESTIMONIAL = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['customer_name', 'review'],
+    'properties': {
+        'customer_name': {'type': 'string'},
+        'review': {'type': 'string'},
+        'rating': RATING
+    }
+})
+
+VALIDATE_TESTIMONIAL_UPDATE = fastjsonschema.compile({
+    'type': 'object',
+    'properties': {
+        'rating': RATING
+    }
+})
+
+VALIDATE_TESTIMONIAL_BULK = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['ids', 'approved'],
+    'properties': {
+        'ids': ID_LIST,
+        'approved': {'type': 'boolean'}
+    }
+})
+
+VALIDATE_CALLBACK = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['name', 'phone'],
+    'properties': {
+        'name': {'type': 'string'},
+        'phone': {'type': 'string'}
+    }
+})
+
+VALIDATE_CALLBACK_UPDATE = fastjsonschema.compile({
+    'type': 'object',
+    'properties': {
+        'status': {'enum': list(CALLBACK_STATUSES)}
+    }
+})
+
+VALIDATE_CALLBACK_BULK = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['ids', 'status'],
+    'properties': {
+        'ids': ID_LIST,
+        'status': {'enum': list(CALLBACK_STATUSES)}
+    }
+})
+
+VALIDATE_REGISTER = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['name', 'email', 'phone', 'password'],
+    'properties': {
+        'name': {'type': 'string'},
+        'email': {'type': 'string'},
+        'phone': {'type': 'string'},
+        'password': {'type': 'string'}
+    }
+})
+
+VALIDATE_USER = fastjsonschema.compile({
+    'type': 'object',
+    'required': ['username', 'password', 'role'],
+    'properties': {
+        'username': {'type': 'string'},
+        'password': {'type': 'string'},
+        'role': {'enum': sorted(STAFF_ROLES)}
+    }
+})
+
+VALIDATE_USER_UPDATE = fastjsonschema.compile({
+    'type': 'object',
+    'properties': {
+        'password': {'type': 'string'},
+        'role': {'enum': sorted(STAFF_ROLES)}
+    }
+})
+
+def schema_error(validator, data):
+    """Run a compiled validator and return its error message, or None if data is valid.
+    
+    Missing fields and values outside an enum get the API's own wording
+    ("Missing required fields: ...", "Invalid role. Allowed roles: ...");
+    other failures return fastjsonschema's message.
+    """
+    try:
+        validator(data)
+    except JsonSchemaException as e:
+        rule = getattr(e, 'rule', None)
+        if rule == 'required':
+            return f"Missing required fields: {', '.join(e.definition['required'])}"
+        if rule == 'enum':
+            field = e.name.rpartition('.')[2]
+            plural = field + ('es' if field.endswith('s') else 's')
+            return f"Invalid {field}. Allowed {plural}: {', '.join(map(str, e.definition['enum']))}"
+        return e.message
+    return None
+
+def parse_id(value):
+    """Return a numeric route id as an int, or None if it is not one."""
+    return int(value) if value.isascii() and value.isdigit() else None
+
+# ==================== ERROR HANDLERS ====================
+
+@app.errorhandler(Error)
+def handle_db_error(e):
+    """Turn any MySQL error that escapes a route into a JSON 500."""
+    print(f"Database error on {request.method} {request.path}: {e}")
+    return jsonify({'message': 'Database error'}), 500
+
 # ==================== CORS PREFLIGHT HANDLER ====================
 
-@app.before_request
-def handle_preflight():
-    """Handle CORS preflight requests"""
-    if request.method == "OPTIONS":
-        response = jsonify({'status': 'ok'})
-        origin = request.headers.get('Origin')
-        if origin:
-            response.headers.add("Access-Control-Allow-Origin", origin)
-        else:
-            response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "Content-Type,Authorization,X-Requested-With")
-        response.headers.add('Access-Control-Allow-Methods', "GET,PUT,POST,DELETE,OPTIONS")
-        response.headers.add('Access-Control-Allow-Credentials', "true")
-        response.headers.add('Access-Control-Max-Age', "3600")
-        return response, 200
+class PreflightMiddleware:
+    """Answer CORS preflight (OPTIONS) requests for /api/ routes at the WSGI layer.
+    
+    Preflights never reach Flask, so they skip the request context, routing
+    and the before/after request hooks entirely.
+    """
+    # Browsers ignore the preflight body, so send none. Max-Age lets them reuse
+    # the preflight for a day (the most Firefox allows; Chromium caps it at
+    # two hours).
+    headers = [
+        ('Access-Control-Allow-Headers', 'Content-Type,Authorization,X-Requested-With'),
+        ('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS'),
+        ('Access-Control-Allow-Credentials', 'true'),
+        ('Access-Control-Max-Age', '86400'),
+        ('Vary', 'Origin'),
+    ]
+    
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+    
+    def __call__(self, environ, start_response):
+        if environ['REQUEST_METHOD'] != 'OPTIONS' or not environ.get('PATH_INFO', '').startswith('/api/'):
+            return self.wsgi_app(environ, start_response)
+        origin = environ.get('HTTP_ORIGIN') or '*'
+        start_response('204 NO CONTENT', [('Access-Control-Allow-Origin', origin)] + self.headers)
+        return []
+
+app.wsgi_app = PreflightMiddleware(app.wsgi_app)
 
 # ==================== ROOT ROUTE ====================
 
+# The root document never changes, so serialize it once at import. The root
+# route doubles as a health check and is hit far more often than the API.
+ROOT_BODY = json.dumps({
+    'message': 'Local Pharmacy API',
+    'version': '1.0.0',
+    'endpoints': {
+        'products': '/api/products',
+        'orders': '/api/orders',
+        'offers': '/api/offers',
+        'admin': '/api/admin'
+    }
+}, separators=(',', ':'), sort_keys=True).encode() + b'\n'
+
 @app.route('/', methods=['GET'])
 def root():
-    return jsonify({
-        'message': 'Local Pharmacy API',
-        'version': '1.0.0',
-        'endpoints': {
-            'products': '/api/products',
-            'orders': '/api/orders',
-            'offers': '/api/offers',
-            'admin': '/api/admin'
-        }
-    }), 200
+    return app.response_class(ROOT_BODY, mimetype='application/json'), 200
 
 # ==================== AUTH ROUTES ====================
 
@@ -291,21 +1076,19 @@ def unified_login():
     if not identifier or not password:
         return jsonify({'message': 'Identifier (username/phone) and password required'}), 400
     
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
     
-    # Try to find user by username first (for admin)
-    cursor.execute("SELECT * FROM users WHERE username = %s", (identifier,))
+    # Match by username (admin) or phone (customer) in one indexed lookup,
+    # preferring the username match if both exist
+    cursor.execute(
+        f"SELECT {USER_LOGIN_COLUMNS} FROM users WHERE username = %s OR phone = %s ORDER BY username = %s DESC LIMIT 1",
+        (identifier, identifier, identifier)
+    )
     user = cursor.fetchone()
-    
-    # If not found by username, try by phone (for customer)
-    if not user:
-        cursor.execute("SELECT * FROM users WHERE phone = %s", (identifier,))
-        user = cursor.fetchone()
-    
     cursor.close()
     
-    if user and check_password_hash(user['password'], password):
+    if user and verify_password(user, password):
         user_id = str(user['id'])
         access_token = create_access_token(identity=user_id)
         
@@ -330,7 +1113,7 @@ def unified_login():
     return jsonify({'message': 'Invalid credentials'}), 401
 
 @app.route('/api/verify', methods=['GET'])
-@jwt_required()
+@token_required
 def verify_token():
     """
     Verify Token
@@ -365,11 +1148,7 @@ def verify_token():
         description: User not found
     """
     user_id = get_jwt_identity()
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM users WHERE id = %s", (user_id,))
-    user = cursor.fetchone()
-    cursor.close()
+    user = _get_user_by_id(user_id)
     
     if user:
         response_data = {
@@ -407,13 +1186,13 @@ def admin_login():
     if not username or not password:
         return jsonify({'message': 'Username and password required'}), 400
     
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM users WHERE username = %s", (username,))
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(f"SELECT {USER_LOGIN_COLUMNS} FROM users WHERE username = %s", (username,))
     user = cursor.fetchone()
     cursor.close()
     
-    if user and check_password_hash(user['password'], password):
+    if user and verify_password(user, password):
         user_id = str(user['id'])
         access_token = create_access_token(identity=user_id)
         return jsonify({
@@ -425,7 +1204,7 @@ def admin_login():
     return jsonify({'message': 'Invalid credentials'}), 401
 
 @app.route('/api/admin/verify', methods=['GET'])
-@jwt_required()
+@token_required
 def verify_admin_token():
     """
     Verify Admin Token (Deprecated - Use /api/verify instead)
@@ -436,11 +1215,7 @@ def verify_admin_token():
     description: DEPRECATED - Use /api/verify instead.
     """
     user_id = get_jwt_identity()
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM users WHERE id = %s", (user_id,))
-    user = cursor.fetchone()
-    cursor.close()
+    user = _get_user_by_id(user_id)
     
     if user:
         response_data = {
@@ -512,29 +1287,34 @@ def register():
         description: Missing required fields or user already exists
     """
     data = request.get_json()
-    required_fields = ['name', 'email', 'phone', 'password']
+    error = schema_error(VALIDATE_REGISTER, data)
+    if error:
+        return jsonify({'message': error}), 400
     
-    if not all(field in data for field in required_fields):
-        return jsonify({'message': 'Missing required fields: name, email, phone, password'}), 400
+    email = blank_to_null(data['email'])
     
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
     
-    # Check if user already exists
-    cursor.execute("SELECT * FROM users WHERE email = %s OR phone = %s", (data['email'], data['phone']))
-    existing_user = cursor.fetchone()
-    if existing_user:
-        cursor.close()
-        return jsonify({'message': 'Email or phone already exists'}), 400
+    # Duplicate email/phone is rejected by the unique indexes on users. Only a
+    # database where they could not be created needs the pre-check query.
+    if not user_contacts_unique(cursor):
+        cursor.execute("SELECT id FROM users WHERE email = %s OR phone = %s LIMIT 1", (email, data['phone']))
+        if cursor.fetchone():
+            cursor.close()
+            return jsonify({'message': 'Email or phone already exists'}), 400
     
     # Create user with default role 'customer'
-    cursor.execute(
-        "INSERT INTO users (name, email, phone, password, address, role) VALUES (%s, %s, %s, %s, %s, %s)",
-        (data['name'], data['email'], data['phone'], generate_password_hash(data['password']), 
-         data.get('address', ''), 'customer')
-    )
+    try:
+        cursor.execute(
+            "INSERT INTO users (name, email, phone, password, address, role) VALUES (%s, %s, %s, %s, %s, %s)",
+            (data['name'], email, data['phone'], hash_password(data['password']), 
+             data.get('address', ''), 'customer')
+        )
+    except IntegrityError:
+        cursor.close()
+        return jsonify({'message': 'Email or phone already exists'}), 400
     user_id = cursor.lastrowid
-    db_connection.commit()
     cursor.close()
     
     # Create access token
@@ -545,16 +1325,13 @@ def register():
         'user_id': str(user_id),
         'access_token': access_token,
         'name': data['name'],
-        'email': data['email'],
+        'email': email,
         'phone': data['phone'],
         'role': 'customer'
     }), 201
 
-# Keep old customer register for backward compatibility
-@app.route('/api/customers/register', methods=['POST'])
-def customer_register():
-    """Deprecated - Use /api/register instead"""
-    return register()
+# Keep old customer register for backward compatibility (deprecated - use /api/register)
+app.add_url_rule('/api/customers/register', 'customer_register', register, methods=['POST'])
 
 @app.route('/api/customers/login', methods=['POST'])
 def customer_login():
@@ -566,13 +1343,13 @@ def customer_login():
     if not phone or not password:
         return jsonify({'message': 'Phone number and password required'}), 400
     
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM users WHERE phone = %s AND role = 'customer'", (phone,))
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(f"SELECT {USER_LOGIN_COLUMNS} FROM users WHERE phone = %s AND role = 'customer'", (phone,))
     user = cursor.fetchone()
     cursor.close()
     
-    if user and check_password_hash(user['password'], password):
+    if user and verify_password(user, password):
         user_id = str(user['id'])
         access_token = create_access_token(identity=user_id)
         return jsonify({
@@ -586,15 +1363,11 @@ def customer_login():
     return jsonify({'message': 'Invalid credentials'}), 401
 
 @app.route('/api/customers/verify', methods=['GET'])
-@jwt_required()
+@token_required
 def verify_customer_token():
     """Deprecated - Use /api/verify instead"""
     user_id = get_jwt_identity()
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM users WHERE id = %s", (user_id,))
-    user = cursor.fetchone()
-    cursor.close()
+    user = _get_user_by_id(user_id)
     
     if user:
         return jsonify({
@@ -675,36 +1448,28 @@ def create_user():
               example: "Admin access required"
     """
     data = request.get_json()
-    required_fields = ['username', 'password', 'role']
-    
-    if not all(field in data for field in required_fields):
-        return jsonify({'message': 'Missing required fields: username, password, role'}), 400
+    error = schema_error(VALIDATE_USER, data)
+    if error:
+        return jsonify({'message': error}), 400
     
-    if data['role'] not in ['admin', 'driver', 'helper']:
-        return jsonify({'message': 'Invalid role. Allowed roles: admin, driver, helper'}), 400
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
     
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
-    
-    # Check if user already exists
-    cursor.execute("SELECT * FROM users WHERE username = %s", (data['username'],))
-    existing_user = cursor.fetchone()
-    if existing_user:
+    # The unique username and email indexes reject duplicates in the INSERT itself
+    try:
+        user = insert_and_fetch(cursor, 'users', {
+            'username': data['username'],
+            'password': hash_password(data['password']),
+            'email': blank_to_null(data.get('email')),
+            'role': data['role']
+        }, columns=USER_STAFF_COLUMNS)
+    except IntegrityError as e:
         cursor.close()
+        if 'uq_users_email' in str(e):
+            return jsonify({'message': 'Email already exists'}), 400
         return jsonify({'message': 'Username already exists'}), 400
-    
-    cursor.execute(
-        "INSERT INTO users (username, password, email, role) VALUES (%s, %s, %s, %s)",
-        (data['username'], generate_password_hash(data['password']), data.get('email', ''), data['role'])
-    )
-    user_id = cursor.lastrowid
-    db_connection.commit()
-    
-    cursor.execute("SELECT id, username, email, role, created_at FROM users WHERE id = %s", (user_id,))
-    user = cursor.fetchone()
     cursor.close()
     
-    user['id'] = str(user['id'])
     return jsonify(user), 201
 
 @app.route('/api/users', methods=['GET'])
@@ -726,9 +1491,21 @@ def get_users():
         required: false
         description: Filter users by role
         enum: [admin, driver, helper]
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        default: 50
+        description: Maximum number of users to return (capped at 200)
+      - in: query
+        name: skip
+        type: integer
+        required: false
+        default: 0
+        description: Number of users to skip
     responses:
       200:
-        description: List of users
+        description: List of users. The total number of matching users is returned in the X-Total-Count header.
         schema:
           type: array
           items:
@@ -754,22 +1531,24 @@ def get_users():
               example: "Admin access required"
     """
     role_filter = request.args.get('role', '')
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
+    limit, skip = get_pagination()
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
     
     if role_filter:
-        cursor.execute("SELECT id, username, email, role, created_at FROM users WHERE role = %s ORDER BY username", (role_filter,))
+        where, params = "WHERE role = %s", (role_filter,)
     else:
-        cursor.execute("SELECT id, username, email, role, created_at FROM users ORDER BY username")
+        where, params = "", ()
     
-    users = cursor.fetchall()
-    cursor.close()
-    
-    # Convert id to string
-    for user in users:
-        user['id'] = str(user['id'])
+    cursor.execute(f"SELECT COUNT(*) as count FROM users {where}", params)
+    total = cursor.fetchone()['count']
     
-    return jsonify(users), 200
+    # id is converted to a string by MySQL, so rows are returned as fetched
+    cursor.execute(
+        f"SELECT {USER_STAFF_COLUMNS} FROM users {where} ORDER BY username LIMIT %s OFFSET %s",
+        params + (limit, skip)
+    )
+    return paginated_response(cursor, total), 200
 
 @app.route('/api/users/<user_id>', methods=['PUT'])
 @admin_required
@@ -806,50 +1585,38 @@ def update_user(user_id):
       200:
         description: User updated successfully
       400:
-        description: Invalid role or user ID
+        description: Invalid role or user ID, or email already exists
       404:
         description: User not found
       403:
         description: Admin access required
     """
+    user_id = parse_id(user_id)
+    if user_id is None:
+        return jsonify({'message': 'Invalid user ID'}), 400
+    
+    data = request.get_json()
+    error = schema_error(VALIDATE_USER_UPDATE, data)
+    if error:
+        return jsonify({'message': error}), 400
+    values = pick_fields(data, USER_UPDATE_FIELDS)
+    if not values:
+        return jsonify({'message': 'No fields to update'}), 400
+    
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
     try:
-        data = request.get_json()
-        updates = []
-        params = []
-        
-        if 'password' in data:
-            updates.append("password = %s")
-            params.append(generate_password_hash(data['password']))
-        if 'email' in data:
-            updates.append("email = %s")
-            params.append(data['email'])
-        if 'role' in data:
-            if data['role'] not in ['admin', 'driver', 'helper']:
-                return jsonify({'message': 'Invalid role'}), 400
-            updates.append("role = %s")
-            params.append(data['role'])
-        
-        if not updates:
-            return jsonify({'message': 'No fields to update'}), 400
-        
-        params.append(user_id)
-        get_db()
-        cursor = db_connection.cursor(dictionary=True)
-        cursor.execute(f"UPDATE users SET {', '.join(updates)} WHERE id = %s", params)
-        db_connection.commit()
-        
-        if cursor.rowcount == 0:
-            cursor.close()
-            return jsonify({'message': 'User not found'}), 404
-        
-        cursor.execute("SELECT id, username, email, role, created_at FROM users WHERE id = %s", (user_id,))
-        user = cursor.fetchone()
+        user = update_and_fetch(cursor, 'users', values, user_id, columns=USER_STAFF_COLUMNS)
+    except IntegrityError:
         cursor.close()
-        
-        user['id'] = str(user['id'])
-        return jsonify(user), 200
-    except Exception as e:
-        return jsonify({'message': f'Invalid user ID: {str(e)}'}), 400
+        return jsonify({'message': 'Email already exists'}), 400
+    cursor.close()
+    _invalidate_user(user_id)
+    
+    if not user:
+        return jsonify({'message': 'User not found'}), 404
+    
+    return jsonify(user), 200
 
 @app.route('/api/users/<user_id>', methods=['DELETE'])
 @admin_required
@@ -905,20 +1672,21 @@ def delete_user(user_id):
                 type: string
                 example: https://example.com/image.jpg
     """
-    try:
-        get_db()
-        cursor = db_connection.cursor()
-        cursor.execute("DELETE FROM users WHERE id = %s", (user_id,))
-        db_connection.commit()
-        
-        if cursor.rowcount == 0:
-            cursor.close()
-            return jsonify({'message': 'User not found'}), 404
-        
+    user_id = parse_id(user_id)
+    if user_id is None:
+        return jsonify({'message': 'Invalid user ID'}), 400
+    
+    conn = get_db()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM users WHERE id = %s", (user_id,))
+    _invalidate_user(user_id)
+    
+    if cursor.rowcount == 0:
         cursor.close()
-        return jsonify({'message': 'User deleted successfully'}), 200
-    except Exception as e:
-        return jsonify({'message': f'Invalid user ID: {str(e)}'}), 400
+        return jsonify({'message': 'User not found'}), 404
+    
+    cursor.close()
+    return jsonify({'message': 'User deleted successfully'}), 200
 
 @app.route('/api/products/<product_id>', methods=['GET'])
 def get_product(product_id):
@@ -960,19 +1728,19 @@ def get_product(product_id):
       404:
         description: Product not found
     """
-    try:
-        get_db()
-        cursor = db_connection.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM products WHERE id = %s", (product_id,))
-        product = cursor.fetchone()
-        cursor.close()
-        
-        if product:
-            product['id'] = str(product['id'])
-            return jsonify(product), 200
-        return jsonify({'message': 'Product not found'}), 404
-    except Exception as e:
-        return jsonify({'message': f'Invalid product ID: {str(e)}'}), 400
+    product_id = parse_id(product_id)
+    if product_id is None:
+        return jsonify({'message': 'Invalid product ID'}), 400
+    
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(f"SELECT {PRODUCT_COLUMNS} FROM products WHERE id = %s", (product_id,))
+    product = cursor.fetchone()
+    cursor.close()
+    
+    if product:
+        return jsonify(product), 200
+    return jsonify({'message': 'Product not found'}), 404
 
 @app.route('/api/products', methods=['POST'])
 @admin_required
@@ -1035,26 +1803,24 @@ def create_product():
         description: Admin access required
     """
     data = request.get_json()
-    required_fields = ['name', 'price', 'stock']
-    
-    if not all(field in data for field in required_fields):
-        return jsonify({'message': 'Missing required fields'}), 400
-    
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
-    cursor.execute(
-        "INSERT INTO products (name, description, price, stock, category, image) VALUES (%s, %s, %s, %s, %s, %s)",
-        (data['name'], data.get('description', ''), float(data['price']), int(data['stock']), 
-         data.get('category', 'General'), data.get('image', ''))
-    )
-    product_id = cursor.lastrowid
-    db_connection.commit()
+    error = schema_error(VALIDATE_PRODUCT, data)
+    if error:
+        return jsonify({'message': error}), 400
     
-    cursor.execute("SELECT * FROM products WHERE id = %s", (product_id,))
-    product = cursor.fetchone()
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    product = insert_and_fetch(cursor, 'products', {
+        'name': data['name'],
+        'description': data.get('description', ''),
+        'price': float(data['price']),
+        'stock': int(data['stock']),
+        'category': data.get('category', 'General'),
+        'image': data.get('image', '')
+    }, columns=PRODUCT_COLUMNS)
     cursor.close()
+    _invalidate_stats()
+    shared_cache_delete('products:first')
     
-    product['id'] = str(product['id'])
     return jsonify(product), 201
 
 @app.route('/api/products/<product_id>', methods=['PUT'])
@@ -1112,51 +1878,28 @@ def update_product(product_id):
       403:
         description: Admin access required
     """
-    try:
-        data = request.get_json()
-        updates = []
-        params = []
-        
-        if 'name' in data:
-            updates.append("name = %s")
-            params.append(data['name'])
-        if 'description' in data:
-            updates.append("description = %s")
-            params.append(data['description'])
-        if 'price' in data:
-            updates.append("price = %s")
-            params.append(float(data['price']))
-        if 'stock' in data:
-            updates.append("stock = %s")
-            params.append(int(data['stock']))
-        if 'category' in data:
-            updates.append("category = %s")
-            params.append(data['category'])
-        if 'image' in data:
-            updates.append("image = %s")
-            params.append(data['image'])
-        
-        if not updates:
-            return jsonify({'message': 'No fields to update'}), 400
-        
-        params.append(product_id)
-        get_db()
-        cursor = db_connection.cursor(dictionary=True)
-        cursor.execute(f"UPDATE products SET {', '.join(updates)} WHERE id = %s", params)
-        db_connection.commit()
-        
-        if cursor.rowcount == 0:
-            cursor.close()
-            return jsonify({'message': 'Product not found'}), 404
-        
-        cursor.execute("SELECT * FROM products WHERE id = %s", (product_id,))
-        product = cursor.fetchone()
-        cursor.close()
-        
-        product['id'] = str(product['id'])
-        return jsonify(product), 200
-    except Exception as e:
-        return jsonify({'message': f'Invalid product ID: {str(e)}'}), 400
+    product_id = parse_id(product_id)
+    if product_id is None:
+        return jsonify({'message': 'Invalid product ID'}), 400
+    
+    data = request.get_json()
+    error = schema_error(VALIDATE_PRODUCT_UPDATE, data)
+    if error:
+        return jsonify({'message': error}), 400
+    values = pick_fields(data, PRODUCT_UPDATE_FIELDS)
+    if not values:
+        return jsonify({'message': 'No fields to update'}), 400
+    
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    product = update_and_fetch(cursor, 'products', values, product_id, columns=PRODUCT_COLUMNS)
+    cursor.close()
+    shared_cache_delete('products:first')
+    
+    if not product:
+        return jsonify({'message': 'Product not found'}), 404
+    
+    return jsonify(product), 200
 
 @app.route('/api/products/<product_id>', methods=['DELETE'])
 @admin_required
@@ -1186,20 +1929,22 @@ def delete_product(product_id):
       403:
         description: Admin access required
     """
-    try:
-        get_db()
-        cursor = db_connection.cursor()
-        cursor.execute("DELETE FROM products WHERE id = %s", (product_id,))
-        db_connection.commit()
-        
-        if cursor.rowcount == 0:
-            cursor.close()
-            return jsonify({'message': 'Product not found'}), 404
-        
+    product_id = parse_id(product_id)
+    if product_id is None:
+        return jsonify({'message': 'Invalid product ID'}), 400
+    
+    conn = get_db()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM products WHERE id = %s", (product_id,))
+    
+    if cursor.rowcount == 0:
         cursor.close()
-        return jsonify({'message': 'Product deleted successfully'}), 200
-    except Exception as e:
-        return jsonify({'message': f'Invalid product ID: {str(e)}'}), 400
+        return jsonify({'message': 'Product not found'}), 404
+    
+    cursor.close()
+    _invalidate_stats()
+    shared_cache_delete('products:first')
+    return jsonify({'message': 'Product deleted successfully'}), 200
 
 # ==================== PRODUCT ROUTES (LIST) ====================
 
@@ -1218,30 +1963,49 @@ def get_products():
         type: string
         required: false
         description: Search products by name, description, or category
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        default: 50
+        description: Maximum number of products to return (capped at 200)
+      - in: query
+        name: skip
+        type: integer
+        required: false
+        default: 0
+        description: Number of products to skip
     responses:
       200:
-        description: List of products
+        description: List of products. The total number of matching products is returned in the X-Total-Count header.
     """
     search = request.args.get('search', '')
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
-    
-    if search:
-        cursor.execute(
-            "SELECT * FROM products WHERE name LIKE %s OR description LIKE %s OR category LIKE %s ORDER BY name",
-            (f'%{search}%', f'%{search}%', f'%{search}%')
-        )
+    limit, skip = get_pagination()
+    # Only the default first page of the unfiltered catalogue is shared-cached
+    cache_key = 'products:first' if not search and limit == DEFAULT_PAGE_SIZE and skip == 0 else None
+    cached = shared_cache_get(cache_key)
+    if cached:
+        return cached, 200
+    
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    
+    fulltext = fulltext_query(search) if search else None
+    if fulltext:
+        # Served by the ft_products_search FULLTEXT index instead of a table scan
+        where, params = "WHERE MATCH(name, description, category) AGAINST (%s IN BOOLEAN MODE)", (fulltext,)
+    elif search:
+        # Too short for the full-text index, fall back to a substring match
+        where = "WHERE name LIKE %s OR description LIKE %s OR category LIKE %s"
+        params = (f'%{search}%', f'%{search}%', f'%{search}%')
     else:
-        cursor.execute("SELECT * FROM products ORDER BY name")
-    
-    products = cursor.fetchall()
-    cursor.close()
+        where, params = "", ()
     
-    # Convert id to string
-    for product in products:
-        product['id'] = str(product['id'])
+    cursor.execute(f"SELECT COUNT(*) as count FROM products {where}", params)
+    total = cursor.fetchone()['count']
     
-    return jsonify(products), 200
+    cursor.execute(f"SELECT {PRODUCT_COLUMNS} FROM products {where} ORDER BY name LIMIT %s OFFSET %s", params + (limit, skip))
+    return paginated_response(cursor, total, cache_key=cache_key), 200
 
 # ==================== ORDER ROUTES ====================
 
@@ -1253,7 +2017,7 @@ def create_order():
     tags:
       - Orders
     summary: Create a new order
-    description: Create a new customer order. Automatically applies offer codes and updates product stock.
+    description: Create a new customer order. Prices come from the product catalogue; offer codes are applied and product stock is updated.
     parameters:
       - in: body
         name: body
@@ -1263,7 +2027,6 @@ def create_order():
           required:
             - customer
             - items
-            - total
           properties:
             customer:
               type: object
@@ -1296,6 +2059,7 @@ def create_order():
                     type: integer
             total:
               type: number
+              description: Ignored - the total is computed from catalogue prices
               example: 50.99
             offer_code:
               type: string
@@ -1323,68 +2087,125 @@ def create_order():
               type: string
               example: pending
       400:
-        description: Missing required fields or invalid data
+        description: Missing required fields, invalid data or unknown products
+      409:
+        description: Insufficient stock for one or more items
     """
     data = request.get_json()
-    required_fields = ['customer', 'items', 'total']
-    
-    if not all(field in data for field in required_fields):
-        return jsonify({'message': 'Missing required fields'}), 400
-    
-    # Validate customer data
+    error = schema_error(VALIDATE_ORDER, data)
+    if error:
+        return jsonify({'message': error}), 400
     customer = data['customer']
-    if not all(k in customer for k in ['name', 'phone', 'address']):
-        return jsonify({'message': 'Customer details incomplete'}), 400
     
-    # Apply offer code if provided
-    final_total = float(data['total'])
+    # Validate line items before anything is written, merging repeated products
+    # item_ids keeps each line's parsed product id for pricing further down
+    quantities = {}
+    item_ids = []
+    try:
+        for item in data['items']:
+            product_id = int(item['product_id'])
+            quantity = int(item['quantity'])
+            if quantity <= 0:
+                raise ValueError
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+            item_ids.append(product_id)
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'message': 'Invalid order items'}), 400
+    
     offer_code = data.get('offer_code', '')
-    discount = 0
     
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
     
-    if offer_code:
-        cursor.execute("SELECT * FROM offers WHERE code = %s AND active = TRUE", (offer_code,))
-        offer = cursor.fetchone()
-        if offer:
-            if offer['type'] == 'percentage':
-                discount = final_total * (float(offer['value']) / 100)
-            else:
-                discount = float(offer['value'])
-            final_total = max(0, final_total - discount)
-    
-    # Insert order
+    # Connections run in autocommit mode, so open an explicit transaction to
+    # make the stock decrement and the order insert commit or roll back together
+    conn.start_transaction()
+    
+    # Load every ordered product in one query, locking the rows so stock can't
+    # change between the check below and the decrement
+    product_ids = list(quantities)
+    placeholders = ', '.join(['%s'] * len(product_ids))
     cursor.execute(
-        "INSERT INTO orders (customer_name, customer_phone, customer_address, items, subtotal, discount, total, offer_code, status) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)",
-        (customer['name'], customer['phone'], customer['address'], json.dumps(data['items']), 
-         float(data['total']), discount, final_total, offer_code if offer_code else None, 'pending')
+        f"SELECT id, price, stock FROM products WHERE id IN ({placeholders}) FOR UPDATE",
+        product_ids
     )
-    order_id = cursor.lastrowid
-    db_connection.commit()
+    products = {row['id']: row for row in cursor.fetchall()}
     
-    # Update product stock
-    for item in data['items']:
-        cursor.execute("UPDATE products SET stock = stock - %s WHERE id = %s", (item['quantity'], item['product_id']))
-    db_connection.commit()
+    # The offer is read here rather than from the per-worker offer cache, so an
+    # offer another worker just deactivated or edited can't be applied. The
+    # shared lock holds it until the order commits.
+    offer = None
+    if offer_code and len(offer_code) <= OFFER_CODE_MAX_LENGTH:
+        cursor.execute(
+            "SELECT code, type, value FROM offers WHERE code = %s AND active = TRUE LOCK IN SHARE MODE",
+            (offer_code.upper(),)
+        )
+        offer = cursor.fetchone()
     
-    # Fetch created order
-    cursor.execute("SELECT * FROM orders WHERE id = %s", (order_id,))
-    order = cursor.fetchone()
-    cursor.close()
+    missing = [str(product_id) for product_id in quantities if product_id not in products]
+    if missing:
+        conn.rollback()
+        cursor.close()
+        return jsonify({'message': f'Products not found: {", ".join(missing)}'}), 400
+    if any(products[product_id]['stock'] < quantity for product_id, quantity in quantities.items()):
+        conn.rollback()
+        cursor.close()
+        return jsonify({'message': 'Insufficient stock for one or more items'}), 409
     
-    # Format response
-    order['id'] = str(order['id'])
-    order['items'] = json.loads(order['items'])
-    order['customer'] = {
-        'name': order['customer_name'],
-        'phone': order['customer_phone'],
-        'address': order['customer_address']
+    # Price the order from the catalogue rather than trusting client totals
+    for item, product_id in zip(data['items'], item_ids):
+        item['price'] = float(products[product_id]['price'])
+    subtotal = sum(products[product_id]['price'] * quantity for product_id, quantity in quantities.items())
+    discount = Decimal(0)
+    if offer:
+        if offer['type'] == 'percentage':
+            discount = subtotal * offer['value'] / 100
+        else:
+            discount = offer['value']
+    final_total = max(Decimal(0), subtotal - discount)
+    
+    # Decrement stock for every product in one statement
+    cases = ' '.join(['WHEN %s THEN %s'] * len(quantities))
+    cursor.execute(
+        f"UPDATE products SET stock = stock - CASE id {cases} END WHERE id IN ({placeholders})",
+        [value for pair in quantities.items() for value in pair] + product_ids
+    )
+    
+    # Insert order in the same transaction
+    order = {
+        'customer': {
+            'name': customer['name'],
+            'phone': customer['phone'],
+            'address': customer['address']
+        },
+        'items': data['items'],
+        'subtotal': to_money(subtotal),
+        'discount': to_money(discount),
+        'total': to_money(final_total),
+        'offer_code': offer['code'] if offer else None,
+        'status': 'pending'
     }
-    # Remove individual customer fields
-    order.pop('customer_name', None)
-    order.pop('customer_phone', None)
-    order.pop('customer_address', None)
+    # The timestamps come from the column defaults, MySQL's clock like every other
+    # table, and are read back with the new id in the same round trip
+    written = insert_and_fetch(cursor, 'orders', {
+        'customer_name': customer['name'],
+        'customer_phone': customer['phone'],
+        'customer_address': customer['address'],
+        'items': json.dumps(data['items']),
+        'subtotal': order['subtotal'],
+        'discount': order['discount'],
+        'total': order['total'],
+        'offer_code': order['offer_code'],
+        'status': order['status']
+    }, columns="CAST(id AS CHAR) AS id, created_at, updated_at")
+    order.update(written)
+    bump_order_stats(cursor, orders=1, pending=1, revenue=order['total'])
+    conn.commit()
+    _invalidate_stats()
+    # Stock levels shown in the catalogue just changed
+    shared_cache_delete('products:first')
+    
+    cursor.close()
     
     return jsonify(order), 201
 
@@ -1404,6 +2225,18 @@ def get_orders():
         required: false
         description: Filter orders by customer phone number
         example: +1234567890
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        default: 50
+        description: Maximum number of orders to return (capped at 200)
+      - in: query
+        name: skip
+        type: integer
+        required: false
+        default: 0
+        description: Number of orders to skip
     responses:
       200:
         description: List of orders
@@ -1424,33 +2257,23 @@ def get_orders():
                 type: string
     """
     phone = request.args.get('phone', '')
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
+    limit, skip = get_pagination()
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
     
     if phone:
-        cursor.execute("SELECT * FROM orders WHERE customer_phone = %s ORDER BY created_at DESC", (phone,))
+        where, params = "WHERE customer_phone = %s", (phone,)
     else:
-        cursor.execute("SELECT * FROM orders ORDER BY created_at DESC")
+        where, params = "", ()
     
-    orders = cursor.fetchall()
-    cursor.close()
-    
-    # Format orders for response
-    formatted_orders = []
-    for order in orders:
-        order['id'] = str(order['id'])
-        order['items'] = json.loads(order['items'])
-        order['customer'] = {
-            'name': order['customer_name'],
-            'phone': order['customer_phone'],
-            'address': order['customer_address']
-        }
-        order.pop('customer_name', None)
-        order.pop('customer_phone', None)
-        order.pop('customer_address', None)
-        formatted_orders.append(order)
+    cursor.execute(f"SELECT COUNT(*) as count FROM orders {where}", params)
+    total = cursor.fetchone()['count']
     
-    return jsonify(formatted_orders), 200
+    cursor.execute(
+        f"SELECT {ORDER_COLUMNS} FROM orders {where} ORDER BY created_at DESC LIMIT %s OFFSET %s",
+        params + (limit, skip)
+    )
+    return paginated_response(cursor, total, format_order), 200
 
 @app.route('/api/orders/<order_id>', methods=['GET'])
 def get_order(order_id):
@@ -1488,28 +2311,19 @@ def get_order(order_id):
       404:
         description: Order not found
     """
-    try:
-        get_db()
-        cursor = db_connection.cursor(dictionary=True)
-        cursor.execute("SELECT * FROM orders WHERE id = %s", (order_id,))
-        order = cursor.fetchone()
-        cursor.close()
-        
-        if order:
-            order['id'] = str(order['id'])
-            order['items'] = json.loads(order['items'])
-            order['customer'] = {
-                'name': order['customer_name'],
-                'phone': order['customer_phone'],
-                'address': order['customer_address']
-            }
-            order.pop('customer_name', None)
-            order.pop('customer_phone', None)
-            order.pop('customer_address', None)
-            return jsonify(order), 200
-        return jsonify({'message': 'Order not found'}), 404
-    except Exception as e:
-        return jsonify({'message': f'Invalid order ID: {str(e)}'}), 400
+    order_id = parse_id(order_id)
+    if order_id is None:
+        return jsonify({'message': 'Invalid order ID'}), 400
+    
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    cursor.execute(f"SELECT {ORDER_COLUMNS} FROM orders WHERE id = %s", (order_id,))
+    order = cursor.fetchone()
+    cursor.close()
+    
+    if order:
+        return jsonify(format_order(order)), 200
+    return jsonify({'message': 'Order not found'}), 404
 
 @app.route('/api/orders/<order_id>', methods=['PUT'])
 @admin_required
@@ -1558,43 +2372,51 @@ def update_order_status(order_id):
       403:
         description: Admin access required
     """
-    try:
-        data = request.get_json()
-        status = data.get('status')
-        
-        if status not in ['pending', 'confirmed', 'processing', 'shipped', 'delivered', 'cancelled']:
-            return jsonify({'message': 'Invalid status'}), 400
-        
-        get_db()
-        cursor = db_connection.cursor(dictionary=True)
-        cursor.execute("UPDATE orders SET status = %s WHERE id = %s", (status, order_id))
-        db_connection.commit()
-        
-        if cursor.rowcount == 0:
-            cursor.close()
-            return jsonify({'message': 'Order not found'}), 404
-        
-        cursor.execute("SELECT * FROM orders WHERE id = %s", (order_id,))
-        order = cursor.fetchone()
+    order_id = parse_id(order_id)
+    if order_id is None:
+        return jsonify({'message': 'Invalid order ID'}), 400
+    
+    data = request.get_json()
+    error = schema_error(VALIDATE_ORDER_STATUS, data)
+    if error:
+        return jsonify({'message': error}), 400
+    status = data['status']
+    
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    conn.start_transaction()
+    # Lock the row so the stats deltas are taken against the status being replaced
+    cursor.execute("SELECT status, total FROM orders WHERE id = %s FOR UPDATE", (order_id,))
+    previous = cursor.fetchone()
+    if not previous:
+        conn.rollback()
         cursor.close()
-        
-        order['id'] = str(order['id'])
-        order['items'] = json.loads(order['items'])
-        order['customer'] = {
-            'name': order['customer_name'],
-            'phone': order['customer_phone'],
-            'address': order['customer_address']
-        }
-        order.pop('customer_name', None)
-        order.pop('customer_phone', None)
-        order.pop('customer_address', None)
-        
-        return jsonify(order), 200
-    except Exception as e:
-        return jsonify({'message': f'Invalid order ID: {str(e)}'}), 400
+        return jsonify({'message': 'Order not found'}), 404
+    
+    order = update_and_fetch(cursor, 'orders', {'status': status}, order_id, columns=ORDER_COLUMNS)
+    was_counted = previous['status'] != 'cancelled'
+    is_counted = status != 'cancelled'
+    bump_order_stats(
+        cursor,
+        pending=(status == 'pending') - (previous['status'] == 'pending'),
+        revenue=previous['total'] * (is_counted - was_counted)
+    )
+    conn.commit()
+    cursor.close()
+    _invalidate_stats()
+    
+    return jsonify(format_order(order)), 200
 
 # ==================== OFFER ROUTES ====================
 
+# (count, page) queries for ?active=true (the default) and ?active=false
+OFFER_LIST_QUERIES = {
+    True: ("SELECT COUNT(*) as count FROM offers WHERE active = TRUE",
+           f"SELECT {OFFER_COLUMNS} FROM offers WHERE active = TRUE ORDER BY created_at DESC LIMIT %s OFFSET %s"),
+    False: ("SELECT COUNT(*) as count FROM offers",
+            f"SELECT {OFFER_COLUMNS} FROM offers ORDER BY created_at DESC LIMIT %s OFFSET %s"),
+}
+
 @app.route('/api/offers', methods=['GET'])
 def get_offers():
     """
@@ -1611,6 +2433,18 @@ def get_offers():
         required: false
         description: Filter by active status (true/false)
         example: true
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        default: 50
+        description: Maximum number of offers to return (capped at 200)
+      - in: query
+        name: skip
+        type: integer
+        required: false
+        default: 0
+        description: Number of offers to skip
     responses:
       200:
         description: List of offers
@@ -1632,21 +2466,22 @@ def get_offers():
                 type: boolean
     """
     active_only = request.args.get('active', 'true').lower() == 'true'
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
+    limit, skip = get_pagination()
+    # Only the default first page of active offers is shared-cached
+    cache_key = 'offers:active' if active_only and limit == DEFAULT_PAGE_SIZE and skip == 0 else None
+    cached = shared_cache_get(cache_key)
+    if cached:
+        return cached, 200
     
-    if active_only:
-        cursor.execute("SELECT * FROM offers WHERE active = TRUE ORDER BY created_at DESC")
-    else:
-        cursor.execute("SELECT * FROM offers ORDER BY created_at DESC")
-    
-    offers = cursor.fetchall()
-    cursor.close()
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
     
-    for offer in offers:
-        offer['id'] = str(offer['id'])
+    count_sql, page_sql = OFFER_LIST_QUERIES[active_only]
+    cursor.execute(count_sql)
+    total = cursor.fetchone()['count']
     
-    return jsonify(offers), 200
+    cursor.execute(page_sql, (limit, skip))
+    return paginated_response(cursor, total, cache_key=cache_key), 200
 
 @app.route('/api/offers/<offer_code>', methods=['GET'])
 def get_offer(offer_code):
@@ -1683,14 +2518,8 @@ def get_offer(offer_code):
       404:
         description: Offer not found or inactive
     """
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
-    cursor.execute("SELECT * FROM offers WHERE code = %s AND active = TRUE", (offer_code,))
-    offer = cursor.fetchone()
-    cursor.close()
-    
+    offer = lookup_offer(offer_code)
     if offer:
-        offer['id'] = str(offer['id'])
         return jsonify(offer), 200
     return jsonify({'message': 'Offer not found or inactive'}), 404
 
@@ -1753,36 +2582,28 @@ def create_offer():
         description: Admin access required
     """
     data = request.get_json()
-    required_fields = ['code', 'type', 'value']
-    
-    if not all(field in data for field in required_fields):
-        return jsonify({'message': 'Missing required fields'}), 400
-    
-    if data['type'] not in ['percentage', 'fixed']:
-        return jsonify({'message': 'Invalid offer type'}), 400
+    error = schema_error(VALIDATE_OFFER, data)
+    if error:
+        return jsonify({'message': error}), 400
     
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
     
-    # Check if code already exists
-    cursor.execute("SELECT * FROM offers WHERE code = %s", (data['code'].upper(),))
-    existing = cursor.fetchone()
-    if existing:
+    # The UNIQUE index on code rejects duplicates, so no existence check is needed
+    try:
+        offer = insert_and_fetch(cursor, 'offers', {
+            'code': data['code'].upper(),
+            'type': data['type'],
+            'value': float(data['value']),
+            'description': data.get('description', ''),
+            'active': data.get('active', True)
+        }, columns=OFFER_COLUMNS)
+    except IntegrityError:
         cursor.close()
         return jsonify({'message': 'Offer code already exists'}), 400
-    
-    cursor.execute(
-        "INSERT INTO offers (code, type, value, description, active) VALUES (%s, %s, %s, %s, %s)",
-        (data['code'].upper(), data['type'], float(data['value']), data.get('description', ''), data.get('active', True))
-    )
-    offer_id = cursor.lastrowid
-    db_connection.commit()
-    
-    cursor.execute("SELECT * FROM offers WHERE id = %s", (offer_id,))
-    offer = cursor.fetchone()
     cursor.close()
+    _invalidate_offers()
     
-    offer['id'] = str(offer['id'])
     return jsonify(offer), 201
 
 @app.route('/api/offers/<offer_id>', methods=['PUT'])
@@ -1835,47 +2656,28 @@ def update_offer(offer_id):
       403:
         description: Admin access required
     """
-    try:
-        data = request.get_json()
-        updates = []
-        params = []
-        
-        if 'type' in data:
-            if data['type'] not in ['percentage', 'fixed']:
-                return jsonify({'message': 'Invalid offer type'}), 400
-            updates.append("type = %s")
-            params.append(data['type'])
-        if 'value' in data:
-            updates.append("value = %s")
-            params.append(float(data['value']))
-        if 'description' in data:
-            updates.append("description = %s")
-            params.append(data['description'])
-        if 'active' in data:
-            updates.append("active = %s")
-            params.append(data['active'])
-        
-        if not updates:
-            return jsonify({'message': 'No fields to update'}), 400
-        
-        params.append(offer_id)
-        get_db()
-        cursor = db_connection.cursor(dictionary=True)
-        cursor.execute(f"UPDATE offers SET {', '.join(updates)} WHERE id = %s", params)
-        db_connection.commit()
-        
-        if cursor.rowcount == 0:
-            cursor.close()
-            return jsonify({'message': 'Offer not found'}), 404
-        
-        cursor.execute("SELECT * FROM offers WHERE id = %s", (offer_id,))
-        offer = cursor.fetchone()
-        cursor.close()
-        
-        offer['id'] = str(offer['id'])
-        return jsonify(offer), 200
-    except Exception as e:
-        return jsonify({'message': f'Invalid offer ID: {str(e)}'}), 400
+    offer_id = parse_id(offer_id)
+    if offer_id is None:
+        return jsonify({'message': 'Invalid offer ID'}), 400
+    
+    data = request.get_json()
+    error = schema_error(VALIDATE_OFFER_UPDATE, data)
+    if error:
+        return jsonify({'message': error}), 400
+    values = pick_fields(data, OFFER_UPDATE_FIELDS)
+    if not values:
+        return jsonify({'message': 'No fields to update'}), 400
+    
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    offer = update_and_fetch(cursor, 'offers', values, offer_id, columns=OFFER_COLUMNS)
+    cursor.close()
+    _invalidate_offers()
+    
+    if not offer:
+        return jsonify({'message': 'Offer not found'}), 404
+    
+    return jsonify(offer), 200
 
 @app.route('/api/offers/<offer_id>', methods=['DELETE'])
 @admin_required
@@ -1905,23 +2707,32 @@ def delete_offer(offer_id):
       403:
         description: Admin access required
     """
-    try:
-        get_db()
-        cursor = db_connection.cursor()
-        cursor.execute("DELETE FROM offers WHERE id = %s", (offer_id,))
-        db_connection.commit()
-        
-        if cursor.rowcount == 0:
-            cursor.close()
-            return jsonify({'message': 'Offer not found'}), 404
-        
+    offer_id = parse_id(offer_id)
+    if offer_id is None:
+        return jsonify({'message': 'Invalid offer ID'}), 400
+    
+    conn = get_db()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM offers WHERE id = %s", (offer_id,))
+    _invalidate_offers()
+    
+    if cursor.rowcount == 0:
         cursor.close()
-        return jsonify({'message': 'Offer deleted successfully'}), 200
-    except Exception as e:
-        return jsonify({'message': f'Invalid offer ID: {str(e)}'}), 400
+        return jsonify({'message': 'Offer not found'}), 404
+    
+    cursor.close()
+    return jsonify({'message': 'Offer deleted successfully'}), 200
 
 # ==================== TESTIMONIALS ROUTES ====================
 
+# (count, page) queries for ?approved=true (the default) and ?approved=false
+TESTIMONIAL_LIST_QUERIES = {
+    True: ("SELECT COUNT(*) as count FROM testimonials WHERE approved = TRUE",
+           f"SELECT {TESTIMONIAL_COLUMNS} FROM testimonials WHERE approved = TRUE ORDER BY created_at DESC LIMIT %s OFFSET %s"),
+    False: ("SELECT COUNT(*) as count FROM testimonials",
+            f"SELECT {TESTIMONIAL_COLUMNS} FROM testimonials ORDER BY created_at DESC LIMIT %s OFFSET %s"),
+}
+
 @app.route('/api/testimonials', methods=['GET'])
 def get_testimonials():
     """
@@ -1938,6 +2749,18 @@ def get_testimonials():
         required: false
         description: Filter by approval status (true/false). Default is true for public, false for admin.
         example: true
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        default: 50
+        description: Maximum number of testimonials to return (capped at 200)
+      - in: query
+        name: skip
+        type: integer
+        required: false
+        default: 0
+        description: Number of testimonials to skip
     responses:
       200:
         description: List of testimonials
@@ -1960,21 +2783,22 @@ def get_testimonials():
                 type: string
     """
     approved_only = request.args.get('approved', 'true').lower() == 'true'
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
-    
-    if approved_only:
-        cursor.execute("SELECT * FROM testimonials WHERE approved = TRUE ORDER BY created_at DESC")
-    else:
-        cursor.execute("SELECT * FROM testimonials ORDER BY created_at DESC")
+    limit, skip = get_pagination()
+    # Only the default first page of approved testimonials is shared-cached
+    cache_key = 'testimonials:approved' if approved_only and limit == DEFAULT_PAGE_SIZE and skip == 0 else None
+    cached = shared_cache_get(cache_key)
+    if cached:
+        return cached, 200
     
-    testimonials = cursor.fetchall()
-    cursor.close()
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
     
-    for testimonial in testimonials:
-        testimonial['id'] = str(testimonial['id'])
+    count_sql, page_sql = TESTIMONIAL_LIST_QUERIES[approved_only]
+    cursor.execute(count_sql)
+    total = cursor.fetchone()['count']
     
-    return jsonify(testimonials), 200
+    cursor.execute(page_sql, (limit, skip))
+    return paginated_response(cursor, total, cache_key=cache_key), 200
 
 @app.route('/api/testimonials', methods=['POST'])
 def create_testimonial():
@@ -2024,25 +2848,20 @@ def create_testimonial():
         description: Missing required fields
     """
     data = request.get_json()
-    required_fields = ['customer_name', 'review']
-    
-    if not all(field in data for field in required_fields):
-        return jsonify({'message': 'Missing required fields: customer_name, review'}), 400
-    
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
-    cursor.execute(
-        "INSERT INTO testimonials (customer_name, review, rating, approved) VALUES (%s, %s, %s, %s)",
-        (data['customer_name'], data['review'], data.get('rating', 5), False)
-    )
-    testimonial_id = cursor.lastrowid
-    db_connection.commit()
-    
-    cursor.execute("SELECT * FROM testimonials WHERE id = %s", (testimonial_id,))
-    testimonial = cursor.fetchone()
+    error = schema_error(VALIDATE_TESTIMONIAL, data)
+    if error:
+        return jsonify({'message': error}), 400
+    
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    testimonial = insert_and_fetch(cursor, 'testimonials', {
+        'customer_name': data['customer_name'],
+        'review': data['review'],
+        'rating': data.get('rating', 5),
+        'approved': False
+    }, columns=TESTIMONIAL_COLUMNS)
     cursor.close()
     
-    testimonial['id'] = str(testimonial['id'])
     return jsonify(testimonial), 201
 
 @app.route('/api/testimonials/<testimonial_id>', methods=['PUT'])
@@ -2086,45 +2905,82 @@ def update_testimonial(testimonial_id):
       403:
         description: Admin access required
     """
-    try:
-        data = request.get_json()
-        updates = []
-        params = []
-        
-        if 'customer_name' in data:
-            updates.append("customer_name = %s")
-            params.append(data['customer_name'])
-        if 'review' in data:
-            updates.append("review = %s")
-            params.append(data['review'])
-        if 'rating' in data:
-            updates.append("rating = %s")
-            params.append(int(data['rating']))
-        if 'approved' in data:
-            updates.append("approved = %s")
-            params.append(data['approved'])
-        
-        if not updates:
-            return jsonify({'message': 'No fields to update'}), 400
-        
-        params.append(testimonial_id)
-        get_db()
-        cursor = db_connection.cursor(dictionary=True)
-        cursor.execute(f"UPDATE testimonials SET {', '.join(updates)} WHERE id = %s", params)
-        db_connection.commit()
-        
-        if cursor.rowcount == 0:
-            cursor.close()
-            return jsonify({'message': 'Testimonial not found'}), 404
-        
-        cursor.execute("SELECT * FROM testimonials WHERE id = %s", (testimonial_id,))
-        testimonial = cursor.fetchone()
-        cursor.close()
-        
-        testimonial['id'] = str(testimonial['id'])
-        return jsonify(testimonial), 200
-    except Exception as e:
-        return jsonify({'message': f'Invalid testimonial ID: {str(e)}'}), 400
+    testimonial_id = parse_id(testimonial_id)
+    if testimonial_id is None:
+        return jsonify({'message': 'Invalid testimonial ID'}), 400
+    
+    data = request.get_json()
+    error = schema_error(VALIDATE_TESTIMONIAL_UPDATE, data)
+    if error:
+        return jsonify({'message': error}), 400
+    values = pick_fields(data, TESTIMONIAL_UPDATE_FIELDS)
+    if not values:
+        return jsonify({'message': 'No fields to update'}), 400
+    
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    testimonial = update_and_fetch(cursor, 'testimonials', values, testimonial_id, columns=TESTIMONIAL_COLUMNS)
+    cursor.close()
+    shared_cache_delete('testimonials:approved')
+    
+    if not testimonial:
+        return jsonify({'message': 'Testimonial not found'}), 404
+    
+    return jsonify(testimonial), 200
+
+@app.route('/api/testimonials/bulk', methods=['PUT'])
+@admin_required
+def bulk_update_testimonials():
+    """
+    Bulk Approve Testimonials
+    ---
+    tags:
+      - Testimonials
+    summary: Approve or reject several testimonials at once (Admin only)
+    description: Admin endpoint to set the approved flag on a list of testimonials in one request
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - ids
+            - approved
+          properties:
+            ids:
+              type: array
+              maxItems: 200
+              items:
+                type: string
+              example: ["1", "2", "3"]
+            approved:
+              type: boolean
+              example: true
+    responses:
+      200:
+        description: Testimonials updated; updated counts the rows that changed
+      400:
+        description: Invalid ids or approved flag
+      403:
+        description: Admin access required
+    """
+    data = request.get_json()
+    error = schema_error(VALIDATE_TESTIMONIAL_BULK, data)
+    if error:
+        return jsonify({'message': error}), 400
+    # Sorted so concurrent bulk updates lock rows in the same order
+    ids = sorted({int(testimonial_id) for testimonial_id in data['ids']})
+    
+    conn = get_db()
+    cursor = conn.cursor()
+    updated = update_many(cursor, 'testimonials', {'approved': data['approved']}, ids)
+    cursor.close()
+    shared_cache_delete('testimonials:approved')
+    
+    return jsonify({'message': 'Testimonials updated successfully', 'updated': updated}), 200
 
 @app.route('/api/testimonials/<testimonial_id>', methods=['DELETE'])
 @admin_required
@@ -2153,20 +3009,21 @@ def delete_testimonial(testimonial_id):
       403:
         description: Admin access required
     """
-    try:
-        get_db()
-        cursor = db_connection.cursor()
-        cursor.execute("DELETE FROM testimonials WHERE id = %s", (testimonial_id,))
-        db_connection.commit()
-        
-        if cursor.rowcount == 0:
-            cursor.close()
-            return jsonify({'message': 'Testimonial not found'}), 404
-        
+    testimonial_id = parse_id(testimonial_id)
+    if testimonial_id is None:
+        return jsonify({'message': 'Invalid testimonial ID'}), 400
+    
+    conn = get_db()
+    cursor = conn.cursor()
+    cursor.execute("DELETE FROM testimonials WHERE id = %s", (testimonial_id,))
+    shared_cache_delete('testimonials:approved')
+    
+    if cursor.rowcount == 0:
         cursor.close()
-        return jsonify({'message': 'Testimonial deleted successfully'}), 200
-    except Exception as e:
-        return jsonify({'message': f'Invalid testimonial ID: {str(e)}'}), 400
+        return jsonify({'message': 'Testimonial not found'}), 404
+    
+    cursor.close()
+    return jsonify({'message': 'Testimonial deleted successfully'}), 200
 
 # ==================== CALLBACK REQUESTS ROUTES ====================
 
@@ -2222,26 +3079,22 @@ def create_callback_request():
         description: Missing required fields
     """
     data = request.get_json()
-    required_fields = ['name', 'phone']
-    
-    if not all(field in data for field in required_fields):
-        return jsonify({'message': 'Missing required fields: name, phone'}), 400
-    
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
-    cursor.execute(
-        "INSERT INTO callback_requests (name, phone, email, medicine, message, status) VALUES (%s, %s, %s, %s, %s, %s)",
-        (data['name'], data['phone'], data.get('email', ''), data.get('medicine', ''), 
-         data.get('message', ''), 'pending')
-    )
-    request_id = cursor.lastrowid
-    db_connection.commit()
+    error = schema_error(VALIDATE_CALLBACK, data)
+    if error:
+        return jsonify({'message': error}), 400
     
-    cursor.execute("SELECT * FROM callback_requests WHERE id = %s", (request_id,))
-    callback_request = cursor.fetchone()
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    callback_request = insert_and_fetch(cursor, 'callback_requests', {
+        'name': data['name'],
+        'phone': data['phone'],
+        'email': data.get('email', ''),
+        'medicine': data.get('medicine', ''),
+        'message': data.get('message', ''),
+        'status': 'pending'
+    }, columns=CALLBACK_COLUMNS)
     cursor.close()
     
-    callback_request['id'] = str(callback_request['id'])
     return jsonify(callback_request), 201
 
 @app.route('/api/callback-requests', methods=['GET'])
@@ -2262,6 +3115,18 @@ def get_callback_requests():
         type: string
         required: false
         description: Filter by status (pending, contacted, completed)
+      - in: query
+        name: limit
+        type: integer
+        required: false
+        default: 50
+        description: Maximum number of callback requests to return (capped at 200)
+      - in: query
+        name: skip
+        type: integer
+        required: false
+        default: 0
+        description: Number of callback requests to skip
     responses:
       200:
         description: List of callback requests
@@ -2273,21 +3138,23 @@ def get_callback_requests():
         description: Admin access required
     """
     status_filter = request.args.get('status', '')
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
+    limit, skip = get_pagination()
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
     
     if status_filter:
-        cursor.execute("SELECT * FROM callback_requests WHERE status = %s ORDER BY created_at DESC", (status_filter,))
+        where, params = "WHERE status = %s", (status_filter,)
     else:
-        cursor.execute("SELECT * FROM callback_requests ORDER BY created_at DESC")
-    
-    requests = cursor.fetchall()
-    cursor.close()
+        where, params = "", ()
     
-    for req in requests:
-        req['id'] = str(req['id'])
+    cursor.execute(f"SELECT COUNT(*) as count FROM callback_requests {where}", params)
+    total = cursor.fetchone()['count']
     
-    return jsonify(requests), 200
+    cursor.execute(
+        f"SELECT {CALLBACK_COLUMNS} FROM callback_requests {where} ORDER BY created_at DESC LIMIT %s OFFSET %s",
+        params + (limit, skip)
+    )
+    return paginated_response(cursor, total), 200
 
 @app.route('/api/callback-requests/<request_id>', methods=['PUT'])
 @admin_required
@@ -2325,36 +3192,94 @@ def update_callback_request(request_id):
       403:
         description: Admin access required
     """
-    try:
-        data = request.get_json()
-        status = data.get('status')
-        
-        if status and status not in ['pending', 'contacted', 'completed']:
-            return jsonify({'message': 'Invalid status'}), 400
-        
-        if not status:
-            return jsonify({'message': 'No fields to update'}), 400
-        
-        get_db()
-        cursor = db_connection.cursor(dictionary=True)
-        cursor.execute("UPDATE callback_requests SET status = %s WHERE id = %s", (status, request_id))
-        db_connection.commit()
-        
-        if cursor.rowcount == 0:
-            cursor.close()
-            return jsonify({'message': 'Request not found'}), 404
-        
-        cursor.execute("SELECT * FROM callback_requests WHERE id = %s", (request_id,))
-        request_doc = cursor.fetchone()
-        cursor.close()
-        
-        request_doc['id'] = str(request_doc['id'])
-        return jsonify(request_doc), 200
-    except Exception as e:
-        return jsonify({'message': f'Invalid request ID: {str(e)}'}), 400
+    request_id = parse_id(request_id)
+    if request_id is None:
+        return jsonify({'message': 'Invalid request ID'}), 400
+    
+    data = request.get_json()
+    error = schema_error(VALIDATE_CALLBACK_UPDATE, data)
+    if error:
+        return jsonify({'message': error}), 400
+    status = data.get('status')
+    
+    if not status:
+        return jsonify({'message': 'No fields to update'}), 400
+    
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    request_doc = update_and_fetch(cursor, 'callback_requests', {'status': status}, request_id, columns=CALLBACK_COLUMNS)
+    cursor.close()
+    
+    if not request_doc:
+        return jsonify({'message': 'Request not found'}), 404
+    
+    return jsonify(request_doc), 200
+
+@app.route('/api/callback-requests/bulk', methods=['PUT'])
+@admin_required
+def bulk_update_callback_requests():
+    """
+    Bulk Update Callback Request Status
+    ---
+    tags:
+      - Callback Requests
+    summary: Set the status of several callback requests at once (Admin only)
+    description: Admin endpoint to update the status of a list of callback requests in one request
+    security:
+      - Bearer: []
+    parameters:
+      - in: body
+        name: body
+        required: true
+        schema:
+          type: object
+          required:
+            - ids
+            - status
+          properties:
+            ids:
+              type: array
+              maxItems: 200
+              items:
+                type: string
+              example: ["1", "2", "3"]
+            status:
+              type: string
+              enum: [pending, contacted, completed]
+    responses:
+      200:
+        description: Requests updated; updated counts the rows that changed
+      400:
+        description: Invalid ids or status
+      403:
+        description: Admin access required
+    """
+    data = request.get_json()
+    error = schema_error(VALIDATE_CALLBACK_BULK, data)
+    if error:
+        return jsonify({'message': error}), 400
+    # Sorted so concurrent bulk updates lock rows in the same order
+    ids = sorted({int(request_id) for request_id in data['ids']})
+    
+    conn = get_db()
+    cursor = conn.cursor()
+    updated = update_many(cursor, 'callback_requests', {'status': data['status']}, ids)
+    cursor.close()
+    
+    return jsonify({'message': 'Requests updated successfully', 'updated': updated}), 200
 
 # ==================== DASHBOARD STATS ====================
 
+def stats_response(body):
+    """Wrap an encoded stats body with an ETag so polling clients get 304s."""
+    response = app.response_class(body, mimetype='application/json')
+    response.add_etag()
+    # Private: the figures are per-admin and must not sit in a shared cache.
+    # The browser may reuse them for as long as the server-side copy lives.
+    response.cache_control.private = True
+    response.cache_control.max_age = DASHBOARD_STATS_TTL
+    return response.make_conditional(request)
+
 @app.route('/api/admin/stats', methods=['GET'])
 @admin_required
 def get_dashboard_stats():
@@ -2370,6 +3295,10 @@ def get_dashboard_stats():
     responses:
       200:
         description: Dashboard statistics
+        headers:
+          ETag:
+            type: string
+            description: Send back as If-None-Match to get a 304 when nothing changed
         schema:
           type: object
           properties:
@@ -2387,76 +3316,80 @@ def get_dashboard_stats():
               example: 12500.50
             recent_orders:
               type: array
+              description: Latest 5 orders, each in the same shape as GET /api/orders/{order_id}
               items:
                 type: object
+      304:
+        description: Not modified since the ETag sent in If-None-Match
       401:
         description: Unauthorized - Invalid or missing token
       403:
         description: Forbidden - Admin access required
     """
-    get_db()
-    cursor = db_connection.cursor(dictionary=True)
-    
-    cursor.execute("SELECT COUNT(*) as count FROM products")
-    total_products = cursor.fetchone()['count']
-    
-    cursor.execute("SELECT COUNT(*) as count FROM orders")
-    total_orders = cursor.fetchone()['count']
-    
-    cursor.execute("SELECT COUNT(*) as count FROM orders WHERE status = 'pending'")
-    pending_orders = cursor.fetchone()['count']
-    
-    cursor.execute("SELECT SUM(total) as total FROM orders WHERE status != 'cancelled'")
-    revenue_result = cursor.fetchone()
-    total_revenue = float(revenue_result['total']) if revenue_result['total'] else 0
-    
-    cursor.execute("SELECT * FROM orders ORDER BY created_at DESC LIMIT 5")
-    recent_orders = cursor.fetchall()
+    with _stats_cache_lock:
+        body = _stats_cache.get('stats')
+    if body is None:
+        body = shared_cache_read('dashboard:stats')
+        if body is not None:
+            with _stats_cache_lock:
+                _stats_cache['stats'] = body
+    if body is not None:
+        return stats_response(body)
+    
+    conn = get_db()
+    cursor = conn.cursor(dictionary=True)
+    
+    # One round trip: the order figures are read from the running totals in
+    # order_stats, then the recent orders list. idx_created_at serves the
+    # ORDER BY ... LIMIT 5 without sorting the table.
+    results = cursor.execute(
+        "SELECT (SELECT COUNT(*) FROM products) AS total_products, "
+        "total_orders, pending_orders, total_revenue "
+        "FROM order_stats WHERE id = 1; "
+        f"SELECT {ORDER_COLUMNS} FROM orders ORDER BY created_at DESC LIMIT 5",
+        multi=True
+    )
+    stats, recent_orders = [result.fetchall() for result in results if result.with_rows]
+    if not stats:
+        # The order_stats row is missing: seed it from orders, then read it
+        cursor.execute(ORDER_STATS_SEED)
+        cursor.execute(
+            "SELECT (SELECT COUNT(*) FROM products) AS total_products, "
+            "total_orders, pending_orders, total_revenue "
+            "FROM order_stats WHERE id = 1"
+        )
+        stats = cursor.fetchall()
     cursor.close()
     
-    # Format recent orders
-    formatted_orders = []
-    for order in recent_orders:
-        order['id'] = str(order['id'])
-        order['items'] = json.loads(order['items'])
-        order['customer'] = {
-            'name': order['customer_name'],
-            'phone': order['customer_phone'],
-            'address': order['customer_address']
-        }
-        order.pop('customer_name', None)
-        order.pop('customer_phone', None)
-        order.pop('customer_address', None)
-        formatted_orders.append(order)
+    figures = stats[0]
+    total_revenue = figures['total_revenue']
     
-    return jsonify({
-        'total_products': total_products,
-        'total_orders': total_orders,
-        'pending_orders': pending_orders,
-        'total_revenue': total_revenue,
-        'recent_orders': formatted_orders
-    }), 200
-
-# Ensure database is connected before handling requests (skip for OPTIONS)
-@app.before_request
-def ensure_db_connection():
-    """Ensure MySQL connection is established before handling requests."""
-    # Skip database connection for OPTIONS requests
-    if request.method == "OPTIONS":
-        return
-    try:
+    stats = {
+        'total_products': figures['total_products'],
+        'total_orders': figures['total_orders'],
+        'pending_orders': figures['pending_orders'],
+        'total_revenue': float(total_revenue) if total_revenue else 0,
+        'recent_orders': [format_order(order) for order in recent_orders]
+    }
+    # Cache the encoded body so repeat views skip serialization as well
+    body = orjson.dumps(stats, default=app.json.default, option=app.json.option | orjson.OPT_APPEND_NEWLINE)
+    with _stats_cache_lock:
+        _stats_cache['stats'] = body
+    shared_cache_write('dashboard:stats', body, DASHBOARD_STATS_TTL)
+    return stats_response(body)
+
+def init_db():
+    """Create the default admin and any missing indexes. Run once at start-up."""
+    with app.app_context():
         get_db()
-    except Exception as e:
-        # Only fail if not in CI/testing environment
-        if not (os.getenv('CI') or os.getenv('GITHUB_ACTIONS')):
-            print(f"Database connection error: {e}")
+        init_admin()
+        init_indexes()
+        init_order_stats()
 
 if __name__ == '__main__':
-    import sys
     # Initialize database and admin when running directly
     try:
-        get_db()
-        init_admin()
+        init_db()
     except Exception as e:
         print(f"Warning: Could not initialize database: {e}")
         print("App will start but database operations will fail until MySQL connection is configured.")
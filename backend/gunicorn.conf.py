@@ -0,0 +1,30 @@
+# Gunicorn configuration for the Pharmacy API
+# Run from the backend directory: gunicorn -c gunicorn.conf.py app:app
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', 5000)}"
+
+# Handlers spend most of their time waiting on MySQL, so each worker serves
+# many requests concurrently as gevent greenlets instead of one at a time
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gevent')
+workers = int(os.getenv('WEB_CONCURRENCY', 4))
+worker_connections = int(os.getenv('GUNICORN_WORKER_CONNECTIONS', 1000))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+
+accesslog = '-'
+errorlog = '-'
+
+def post_worker_init(worker):
+    """Open each worker's connection pool before it takes traffic, then create
+    the default admin and missing indexes once, from the first worker only."""
+    from app import get_pool
+    try:
+        get_pool()
+    except Exception as e:
+        print(f"Warning: Could not open MySQL connection pool: {e}")
+    if worker.age == 1:
+        from app import init_db
+        try:
+            init_db()
+        except Exception as e:
+            print(f"Warning: Could not initialize database: {e}")
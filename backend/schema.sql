@@ -15,9 +15,8 @@ CREATE TABLE IF NOT EXISTS users (
     address TEXT,
     role ENUM('admin', 'customer', 'driver', 'helper') NOT NULL DEFAULT 'customer',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    INDEX idx_username (username),
-    INDEX idx_phone (phone),
-    INDEX idx_email (email),
+    UNIQUE INDEX uq_users_phone (phone),
+    UNIQUE INDEX uq_users_email (email),
     INDEX idx_role (role)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
@@ -27,13 +26,14 @@ CREATE TABLE IF NOT EXISTS products (
     name VARCHAR(255) NOT NULL,
     description TEXT,
     price DECIMAL(10, 2) NOT NULL,
-    stock INT NOT NULL DEFAULT 0,
+    stock INT NOT NULL DEFAULT 0 CHECK (stock >= 0),
     category VARCHAR(100) DEFAULT 'General',
     image VARCHAR(500),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     INDEX idx_name (name),
-    INDEX idx_category (category)
+    INDEX idx_category (category),
+    FULLTEXT INDEX ft_products_search (name, description, category)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Offers table
@@ -46,8 +46,7 @@ CREATE TABLE IF NOT EXISTS offers (
     active BOOLEAN DEFAULT TRUE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    INDEX idx_code (code),
-    INDEX idx_active (active)
+    INDEX idx_offers_active_created (active, created_at DESC)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
 -- Orders table
@@ -64,12 +63,25 @@ CREATE TABLE IF NOT EXISTS orders (
     status ENUM('pending', 'confirmed', 'processing', 'shipped', 'delivered', 'cancelled') DEFAULT 'pending',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-    INDEX idx_customer_phone (customer_phone),
+    INDEX idx_orders_phone_created (customer_phone, created_at DESC),
     INDEX idx_status (status),
     INDEX idx_created_at (created_at),
     FOREIGN KEY (offer_code) REFERENCES offers(code) ON DELETE SET NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- Running order totals for the admin dashboard (single row, id = 1)
+CREATE TABLE IF NOT EXISTS order_stats (
+    id TINYINT PRIMARY KEY,
+    total_orders INT NOT NULL DEFAULT 0,
+    pending_orders INT NOT NULL DEFAULT 0,
+    total_revenue DECIMAL(14, 2) NOT NULL DEFAULT 0
+) ENGINE=InnoDB;
+
+INSERT IGNORE INTO order_stats (id, total_orders, pending_orders, total_revenue)
+SELECT 1, COUNT(*), COALESCE(SUM(status = 'pending'), 0),
+       COALESCE(SUM(CASE WHEN status != 'cancelled' THEN total END), 0)
+FROM orders;
+
 -- Testimonials table
 CREATE TABLE IF NOT EXISTS testimonials (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -78,7 +90,7 @@ CREATE TABLE IF NOT EXISTS testimonials (
     rating INT DEFAULT 5 CHECK (rating >= 1 AND rating <= 5),
     approved BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    INDEX idx_approved (approved),
+    INDEX idx_testimonials_approved_created (approved, created_at DESC),
     INDEX idx_created_at (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
@@ -92,7 +104,7 @@ CREATE TABLE IF NOT EXISTS callback_requests (
     message TEXT,
     status ENUM('pending', 'contacted', 'completed') DEFAULT 'pending',
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    INDEX idx_status (status),
+    INDEX idx_callbacks_status_created (status, created_at DESC),
     INDEX idx_created_at (created_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
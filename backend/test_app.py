@@ -0,0 +1,84 @@
+"""Request-level tests that run without a MySQL server.
+
+Run from the backend directory: python -m unittest test_app
+"""
+import os
+import unittest
+from unittest import mock
+
+os.environ.setdefault('CI', 'true')
+
+from mysql.connector import IntegrityError
+
+import app as pharmacy
+
+
+class FakeUsersCursor:
+    """Just enough of a cursor for register: the users table with its unique indexes."""
+
+    def __init__(self, table):
+        self.table = table
+        self.rows = []
+        self.lastrowid = None
+
+    def execute(self, sql, params=()):
+        self.rows = []
+        if sql.startswith('SHOW INDEX FROM users'):
+            self.rows = [{'Key_name': name} for name in ('PRIMARY', 'uq_users_phone', 'uq_users_email')]
+        elif sql.startswith('INSERT INTO users'):
+            email, phone = params[1:3]
+            # MySQL unique indexes allow any number of NULLs
+            for row in self.table:
+                if (email is not None and row['email'] == email) or (phone is not None and row['phone'] == phone):
+                    raise IntegrityError(msg="Duplicate entry for key 'users.uq_users_email'")
+            self.table.append({'email': email, 'phone': phone})
+            self.lastrowid = len(self.table)
+
+    def fetchone(self):
+        return self.rows.pop(0) if self.rows else None
+
+    def fetchall(self):
+        rows, self.rows = self.rows, []
+        return rows
+
+    def close(self):
+        pass
+
+
+class FakeUsersConnection:
+    def __init__(self):
+        self.table = []
+
+    def cursor(self, **kwargs):
+        return FakeUsersCursor(self.table)
+
+
+class RegisterTest(unittest.TestCase):
+    def setUp(self):
+        self.conn = FakeUsersConnection()
+        patcher = mock.patch.object(pharmacy, 'get_db', return_value=self.conn)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = pharmacy.app.test_client()
+
+    def register(self, email, phone):
+        return self.client.post('/api/register', json={
+            'name': 'Customer', 'email': email, 'phone': phone, 'password': 'secret'
+        })
+
+    def test_blank_emails_do_not_collide(self):
+        first = self.register('', '5550001')
+        second = self.register('', '5550002')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual([row['email'] for row in self.conn.table], [None, None])
+
+    def test_duplicate_email_is_rejected(self):
+        self.assertEqual(self.register('a@example.com', '5550001').status_code, 201)
+        response = self.register('a@example.com', '5550002')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['message'], 'Email or phone already exists')
+
+
+if __name__ == '__main__':
+    unittest.main()